@@ -1,47 +1,12 @@
-__all__ = [
-    "clean_all_outputs",
-    "save_geotiff",
-    "compute_ndvi",
-    "compute_stitched_bbox",
-    "rasterize_true_color",
-    "stitch_tiles",
-    "validate_image_coverage_with_tile_footprints",
-    "generate_job_id",
-    "get_job_output_paths",
-    "get_orbit_metadata_path",
-    "get_tile_prefix",
-    "prepare_job_output_dirs",
-    "discover_orbit_metadata",
-    "select_best_orbit",
-    "write_selected_orbit",
-    "write_workflow_tile_metadata",
-    "plot_image",
-    "plot_tile_product_overlay",
-    "generate_safe_tiles",
-    "generate_time_intervals",
-]
+from . import utils
+from .utils import __all__
 
-from .utils.file_io import clean_all_outputs, save_geotiff
-from .utils.image_utils import (
-    compute_ndvi,
-    compute_stitched_bbox,
-    rasterize_true_color,
-    stitch_tiles,
-    validate_image_coverage_with_tile_footprints,
-)
-from .utils.job_utils import (
-    generate_job_id,
-    get_job_output_paths,
-    get_orbit_metadata_path,
-    get_tile_prefix,
-    prepare_job_output_dirs,
-)
-from .utils.metadata_utils import (
-    discover_orbit_metadata,
-    select_best_orbit,
-    write_selected_orbit,
-    write_workflow_tile_metadata,
-)
-from .utils.plotting import plot_image, plot_tile_product_overlay
-from .utils.tile_utils import generate_safe_tiles
-from .utils.time_interval_utils import generate_time_intervals
\ No newline at end of file
+
+def __getattr__(name: str):
+    if name in __all__:
+        return getattr(utils, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
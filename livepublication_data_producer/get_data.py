@@ -1,13 +1,8 @@
-import json
-
-from sentinelhub import SHConfig
-
-from evalscripts import discover_evalscript, evalscript_raw_bands
+from evalscripts import evalscript_raw_bands
 from profiles import daily_ndvi_canterbury, viti_levu_ndvi
 
 from .utils.image_utils import (
-    generate_ndvi_products,
-    generate_true_color_products,
+    generate_imagery_products,
     stitch_raw_tile_data,
     validate_image_coverage_with_tile_footprints,
 )
@@ -18,19 +13,13 @@ from .utils.metadata_utils import (
     select_orbits_for_tiles,
 )
 from .utils.plotting import plot_tile_product_overlay
+from .utils.session_utils import get_sh_config
 from .utils.tile_utils import download_orbits_for_tiles, generate_safe_tiles
 
 # === Load config profile ===
 profile = daily_ndvi_canterbury
 
-with open("secrets.json") as f:
-    secrets = json.load(f)
-
-config = SHConfig()
-config.sh_client_id = secrets["sh_client_id"]
-config.sh_client_secret = secrets["sh_client_secret"]
-config.sh_base_url = secrets["sh_base_url"]
-config.sh_token_url = secrets["sh_token_url"]
+config = get_sh_config()
 
 # validate_image_coverage_with_tile_footprints(
 #     stitched_image_path="/Users/eller/Projects/Geo_LivePub/livepublication_data_producer/outputs/australian_bushfires__20191001_20200531/australian_bushfires__20191001_20191031/imagery/true_color.tif",
@@ -52,7 +41,6 @@ tile_metadata = discover_metadata_for_tiles(
     tiles=tiles,
     profile=profile,
     config=config,
-    evalscript=discover_evalscript
 )
 
 selected_orbits = select_orbits_for_tiles(
@@ -64,6 +52,7 @@ selected_orbits = select_orbits_for_tiles(
 product_metadata = discover_orbit_data_metadata(
     paths=paths,
     config=config,
+    selected_orbits=selected_orbits,
 )
 
 tile_info, failed_tiles = download_orbits_for_tiles(
@@ -80,13 +69,7 @@ stitched_image = stitch_raw_tile_data(
     tile_info=tile_info,
 )
 
-generate_ndvi_products(
-    paths=paths,
-    tile_info=tile_info,
-    stitched_image=stitched_image
-)
-
-generate_true_color_products(
+generate_imagery_products(
     paths=paths,
     tile_info=tile_info,
     stitched_image=stitched_image
@@ -1,9 +1,11 @@
 import copy
-import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from sentinelhub import SHConfig
 
-from evalscripts import discover_evalscript, evalscript_raw_bands
+from evalscripts import evalscript_raw_bands
 from profiles import (
     australian_bushfires,
     bi_weekly_ndvi_test,
@@ -15,22 +17,45 @@ from profiles import (
 from .utils import generate_time_intervals
 from .utils.file_io import remove_output_dir
 from .utils.image_utils import (
-    generate_ndvi_products,
-    generate_true_color_products,
+    generate_imagery_products,
     stitch_raw_tile_data,
 )
-from .utils.job_utils import prepare_job_output_dirs
-from .utils.logging_utils import log_warning
+from .utils.job_utils import (
+    get_job_output_paths,
+    is_job_complete,
+    mark_job_complete,
+    prepare_job_output_dirs,
+)
+from .utils.logging_utils import (
+    log_context,
+    log_step,
+    log_success,
+    log_warning,
+    set_inline_logging,
+)
 from .utils.metadata_utils import (
+    MAX_METADATA_WORKERS,
     discover_metadata_for_tiles,
     discover_orbit_data_metadata,
     has_valid_orbits,
     select_orbits_for_tiles,
 )
 from .utils.plotting import plot_tile_product_overlay
-from .utils.tile_utils import download_orbits_for_tiles, generate_safe_tiles
+from .utils.session_utils import get_sh_config
+from .utils.tile_utils import (
+    MAX_DOWNLOAD_WORKERS,
+    download_orbits_for_tiles,
+    generate_safe_tiles,
+)
 from .utils.time_interval_utils import create_timeseries_jobs
 
+# Intervals processed concurrently. Each job's request and encoder pools get an equal share of the
+# process-wide limits below, so running several jobs never multiplies the load on Sentinel Hub.
+JOB_WORKERS = int(os.getenv("LP_JOB_WORKERS", "4"))
+_plot_lock = threading.Lock()
+# Set LP_FORCE=1 to re-run jobs that a previous run already completed
+FORCE_RERUN = os.getenv("LP_FORCE") == "1"
+
 profile = australian_bushfires
 start_date, end_date = profile.time_interval
 
@@ -41,21 +66,47 @@ elif profile.time_series_custom_intervals:
 else:
     raise ValueError("Profile must specify a time_series_mode or custom intervals.")
 
-with open("secrets.json") as f:
-    secrets = json.load(f)
-
-config = SHConfig()
-config.sh_client_id = secrets["sh_client_id"]
-config.sh_client_secret = secrets["sh_client_secret"]
-config.sh_base_url = secrets["sh_base_url"]
-config.sh_token_url = secrets["sh_token_url"]
+config = get_sh_config()
 
 print(f"📆 Time series configured: {len(intervals)} intervals from {start_date} to {end_date}")
 
 timeseries_jobs = create_timeseries_jobs(profile)
 
-for job in timeseries_jobs:
-    print(f"\n⏳ Processing interval: {job.time_interval[0]} to {job.time_interval[1]}")
+job_workers = max(1, min(JOB_WORKERS, len(timeseries_jobs)))
+tile_workers_per_job = max(1, MAX_DOWNLOAD_WORKERS // job_workers)
+metadata_workers_per_job = max(1, MAX_METADATA_WORKERS // job_workers)
+# Two GeoTIFFs (NDVI and true colour) are encoded at once per job
+encode_threads_per_job = max(1, (os.cpu_count() or 1) // (2 * job_workers))
+# Inline progress lines from concurrent jobs would overwrite each other
+set_inline_logging(job_workers == 1)
+
+
+def process_job(
+        job: "DataAcquisitionConfig",
+        config: SHConfig
+    ) -> dict:
+    """
+    Run the full acquisition pipeline for a single time series interval.
+    Args:
+        job (DataAcquisitionConfig): Sub-profile for one interval.
+        config (SHConfig): Shared Sentinel Hub configuration.
+    Returns:
+        dict: Summary with the job_id and its status.
+    """
+    # Every message logged by this job is prefixed with its id, as jobs share the console
+    with log_context(job.job_id):
+        return _process_job(job, config)
+
+
+def _process_job(
+        job: "DataAcquisitionConfig",
+        config: SHConfig
+    ) -> dict:
+    if not FORCE_RERUN and is_job_complete(get_job_output_paths(job)):
+        log_success("Skipping: outputs from a previous run are complete.")
+        return {"job_id": job.job_id, "status": "completed", "failed_tiles": 0}
+
+    log_step(f"⏳ Processing interval: {job.time_interval[0]} to {job.time_interval[1]}")
 
     # Prepare output directories
     paths = prepare_job_output_dirs(job)
@@ -73,15 +124,14 @@ for job in timeseries_jobs:
         tiles=tiles,
         profile=job,
         config=config,
-        evalscript=discover_evalscript
     )
 
     # Check for valid orbits
     if not has_valid_orbits(tile_metadata):
         # Remove output directory for the job
         remove_output_dir(paths)
-        log_warning(f"No valid orbits found for job: {job.job_id}. Skipping job.")
-        continue
+        log_warning("No valid orbits found. Skipping job.")
+        return {"job_id": job.job_id, "status": "skipped"}
     
     # Select orbits
     selected_orbits = select_orbits_for_tiles(
@@ -93,6 +143,8 @@ for job in timeseries_jobs:
     product_metadata = discover_orbit_data_metadata(
         paths=paths,
         config=config,
+        selected_orbits=selected_orbits,
+        max_workers=metadata_workers_per_job,
     )
 
     
@@ -103,7 +155,8 @@ for job in timeseries_jobs:
         selected_orbits=selected_orbits,
         profile=job,
         config=config,
-        evalscript=evalscript_raw_bands
+        evalscript=evalscript_raw_bands,
+        max_workers=tile_workers_per_job
     )
     
     # Stitch tile data
@@ -114,19 +167,26 @@ for job in timeseries_jobs:
     
     if stitched_image is not None and tile_info:
         # Generate NDVI and true color products
-        generate_ndvi_products(
+        generate_imagery_products(
             paths=paths,
             tile_info=tile_info,
-            stitched_image=stitched_image
+            stitched_image=stitched_image,
+            encode_threads=encode_threads_per_job
         )
 
-        generate_true_color_products(
-            paths=paths,
-            tile_info=tile_info,
-            stitched_image=stitched_image
-        )
-        
-        product_overlay = plot_tile_product_overlay(paths)
+        # pyplot keeps global figure state, so the overlay is drawn one job at a time
+        with _plot_lock:
+            plot_tile_product_overlay(paths)
+
+        mark_job_complete(paths)
+        return {"job_id": job.job_id, "status": "completed", "failed_tiles": len(failed_tiles)}
+
+    log_warning("Skipping NDVI and true-color generation — no stitched data available.")
+    return {"job_id": job.job_id, "status": "no_data", "failed_tiles": len(failed_tiles)}
+
+
+with ThreadPoolExecutor(max_workers=job_workers) as executor:
+    results = list(executor.map(lambda job: process_job(job, config), timeseries_jobs))
 
-    else:
-        log_warning("Skipping NDVI and true-color generation — no stitched data available.")
+completed = sum(result["status"] == "completed" for result in results)
+print(f"\n📦 Completed {completed}/{len(results)} intervals")
@@ -1,37 +1,51 @@
 from dataclasses import dataclass
 from datetime import date
-from typing import List, Optional, Tuple
+from typing import Optional, Tuple
 
 from .utils.job_utils import generate_job_id
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DataAcquisitionConfig:
     """
     Configuration class for defining satellite data acquisition jobs.
 
     Attributes:
         region (str): Name or label for the geographic region of interest.
-        bbox (list): Bounding box of the region [min_lon, min_lat, max_lon, max_lat].
+        bbox (Tuple[float, float, float, float]): Bounding box of the region (min_lon, min_lat, max_lon, max_lat).
         time_interval (Tuple[date, date]): Date range for data acquisition.
         resolution (int): Desired resolution in meters.
         output_base_dir (str): Base directory for output files.
         time_series_mode (Optional[str]): If set, defines how to subdivide the time_interval into intervals for timeseries jobs (e.g., 'daily', 'monthly').
-        time_series_custom_intervals (Optional[List[Tuple[date, date]]]): Manually defined list of date intervals to override automatic subdivision.
+        time_series_custom_intervals (Optional[Tuple[Tuple[date, date], ...]]): Manually defined date intervals to override automatic subdivision. Lists are accepted and stored as tuples.
         orbit_selection_strategy (str): Strategy used to select the optimal orbit from available Sentinel data (e.g., 'least_cloud', 'nearest_date').
-        job_id (Optional[str]): Unique identifier automatically generated for the job based on region and time interval. Should not be manually set.
+        job_id (Optional[str]): Unique identifier generated on construction from region and time interval. Should not be manually set.
         parent_job_id (Optional[str]): Internal identifier used for timeseries jobs to associate sub-jobs with their parent job. Not intended for user modification.
+        cache_ttl (Optional[float]): Seconds a cached Catalog search stays valid for re-runs of the same area and interval. None (the default) disables the cache; only opt in for intervals that have closed, since newly ingested scenes are not seen until the entry expires.
     """
     region: str
-    bbox: list  # [min_lon, min_lat, max_lon, max_lat]
+    bbox: Tuple[float, float, float, float]  # (min_lon, min_lat, max_lon, max_lat)
     time_interval: Tuple[date, date]
     resolution: int
     output_base_dir: str
     time_series_mode: Optional[str] = None
-    time_series_custom_intervals: Optional[List[Tuple[date, date]]] = None
+    time_series_custom_intervals: Optional[Tuple[Tuple[date, date], ...]] = None
     orbit_selection_strategy: str = "least_cloud"  # Strategy for selecting best orbit
     job_id: Optional[str] = None
     parent_job_id: Optional[str] = None
+    cache_ttl: Optional[float] = None  # Catalog search cache lifetime in seconds; opt-in
+
+    def __post_init__(self):
+        # Instances are frozen, so normalised fields are set through object.__setattr__
+        object.__setattr__(self, "bbox", tuple(self.bbox))
+        object.__setattr__(self, "time_interval", tuple(self.time_interval))
+        if self.time_series_custom_intervals is not None:
+            # Tuples keep profiles hashable, e.g. as cache keys
+            object.__setattr__(
+                self, "time_series_custom_intervals", tuple(map(tuple, self.time_series_custom_intervals))
+            )
+        if self.job_id is None:
+            object.__setattr__(self, "job_id", generate_job_id(self))
 
 # === Orbit Selection Strategies ===
 # "least_cloud": Select orbit with lowest average cloud coverage.
@@ -43,6 +57,9 @@ class DataAcquisitionConfig:
 Small_bbox = [171.739011,-42.889392,171.771498,-42.866717]
 big_bbox = [172.5, -44.0, 173.2, -43.5]
 auckland = [174.089355,-37.727280,175.989990,-36.253133]
+# === Example cache lifetime for re-runs of historical intervals ===
+one_day_cache = 24 * 60 * 60
+
 # === Example Time Intervals ===
 ten_days = (date(2022, 1, 1), date(2022, 1, 10))
 two_months = (date(2022, 1, 1), date(2022, 3, 31))
@@ -58,7 +75,6 @@ daily_ndvi_canterbury = DataAcquisitionConfig(
     output_base_dir="outputs",
     orbit_selection_strategy='least_cloud'
 )
-daily_ndvi_canterbury.job_id = generate_job_id(daily_ndvi_canterbury)
 
 monthly_rgb_westcoast = DataAcquisitionConfig(
     region='West Coast',
@@ -68,7 +84,6 @@ monthly_rgb_westcoast = DataAcquisitionConfig(
     output_base_dir="outputs",
     orbit_selection_strategy='least_cloud'
 )
-monthly_rgb_westcoast.job_id = generate_job_id(monthly_rgb_westcoast)
 
 custom_ndvi_test = DataAcquisitionConfig(
     region='Test Area',
@@ -78,7 +93,6 @@ custom_ndvi_test = DataAcquisitionConfig(
     output_base_dir="outputs",
     orbit_selection_strategy='least_cloud'
 )
-custom_ndvi_test.job_id = generate_job_id(custom_ndvi_test)
 
 viti_levu_ndvi = DataAcquisitionConfig(
     region='Viti Levu',
@@ -88,7 +102,6 @@ viti_levu_ndvi = DataAcquisitionConfig(
     output_base_dir="outputs",
     orbit_selection_strategy='least_cloud'
 )
-viti_levu_ndvi.job_id = generate_job_id(viti_levu_ndvi)
 
 # ======= example timeseries jobs =======
 bi_weekly_ndvi_test = DataAcquisitionConfig(
@@ -97,10 +110,10 @@ bi_weekly_ndvi_test = DataAcquisitionConfig(
     time_interval=(date(2022, 4, 1), date(2022, 4, 14)),
     resolution=10,
     output_base_dir="outputs",
+    cache_ttl=one_day_cache,
     time_series_mode='daily',
     orbit_selection_strategy='least_cloud'
 )
-bi_weekly_ndvi_test.job_id = generate_job_id(bi_weekly_ndvi_test)
 
 six_months_monthly = DataAcquisitionConfig(
     region='Six Months Monthly',
@@ -108,10 +121,10 @@ six_months_monthly = DataAcquisitionConfig(
     time_interval=(date(2022, 1, 1), date(2022, 6, 30)),
     resolution=10,
     output_base_dir="outputs",
+    cache_ttl=one_day_cache,
     time_series_mode='monthly',
     orbit_selection_strategy='least_cloud'
 )
-six_months_monthly.job_id = generate_job_id(six_months_monthly)
 
 three_years_quarterly = DataAcquisitionConfig(
     region='Three Years Quarterly',
@@ -119,10 +132,10 @@ three_years_quarterly = DataAcquisitionConfig(
     time_interval=(date(2020, 1, 1), date(2023, 1, 1)),
     resolution=10,
     output_base_dir="outputs",
+    cache_ttl=one_day_cache,
     time_series_mode='quarterly',
     orbit_selection_strategy='least_cloud'
 )
-three_years_quarterly.job_id = generate_job_id(three_years_quarterly)
 
 # Example custom intervals
 custom_intervals = time_series_custom_intervals=[
@@ -144,10 +157,10 @@ white_island_eruption = DataAcquisitionConfig(
     time_interval=(date(2019, 11, 20), date(2020, 1, 31)),
     resolution=10,
     output_base_dir="outputs",
+    cache_ttl=one_day_cache,
     time_series_mode='daily',
     orbit_selection_strategy='least_cloud'
 )
-white_island_eruption.job_id = generate_job_id(white_island_eruption)
 
 
 # Example 2019-2020 Australian Bushfires, New South Wales, Bega Valley
@@ -157,7 +170,7 @@ australian_bushfires = DataAcquisitionConfig(
     time_interval=(date(2019, 10, 1), date(2020, 5, 31)),
     resolution=10,
     output_base_dir="outputs",
+    cache_ttl=one_day_cache,
     time_series_mode='monthly',
     orbit_selection_strategy='least_cloud'
-)
-australian_bushfires.job_id = generate_job_id(australian_bushfires)
\ No newline at end of file
+)
\ No newline at end of file
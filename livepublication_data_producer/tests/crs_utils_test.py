@@ -0,0 +1,11 @@
+from utils.crs_utils import get_transformer
+
+
+def test_get_transformer_is_cached_per_crs_pair():
+    transformer = get_transformer("EPSG:32760", "EPSG:4326")
+    assert get_transformer("EPSG:32760", "EPSG:4326") is transformer
+    assert get_transformer("EPSG:4326", "EPSG:32760") is not transformer
+
+    lon, lat = transformer.transform(500000, 10000000)  # UTM 60S false origin
+    assert round(lon, 6) == 177.0
+    assert round(lat, 6) == 0.0
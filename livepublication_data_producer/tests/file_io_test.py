@@ -32,6 +32,9 @@ def test_save_geotiff_grayscale(setup_test_dir):
         assert src.width == 50
         assert src.height == 50
         assert src.crs == crs
+        assert src.compression.value == "LZW"
+        assert src.profile["tiled"]
+        assert np.array_equal(src.read(1), array)
 
 def test_save_geotiff_rgb(setup_test_dir):
     array = np.random.rand(50, 50, 3).astype(np.float32)
@@ -61,3 +64,47 @@ def test_clean_all_outputs_removes_files_and_dirs(tmp_path):
     assert not any(tmp_path.glob("*.npy"))
     assert not any(tmp_path.glob("*.tif"))
     assert not any(tmp_path.glob("*.png"))
+
+def test_save_geotiff_direct_write_above_memory_threshold(setup_test_dir, monkeypatch):
+    import utils.file_io
+
+    monkeypatch.setattr(utils.file_io, "MEMORY_FILE_MAX_BYTES", 0)
+    array = np.random.rand(20, 30).astype(np.float32)
+    crs = CRS.from_epsg(4326)
+
+    save_geotiff(array, TEST_FILE, [0.0, 0.0, 1.0, 1.0], crs)
+
+    with rasterio.open(TEST_FILE) as src:
+        assert src.width == 30
+        assert src.height == 20
+        assert np.allclose(src.read(1), array)
+    assert not os.path.exists(f"{TEST_FILE}.tmp")
+
+def test_save_geotiff_builds_overviews_for_large_rasters(setup_test_dir, monkeypatch):
+    import utils.file_io
+
+    monkeypatch.setattr(utils.file_io, "OVERVIEW_MIN_SIZE", 16)
+    array = np.random.randint(0, 255, (64, 40, 3), dtype=np.uint8)
+    crs = CRS.from_epsg(4326)
+
+    save_geotiff(array, TEST_FILE, [0.0, 0.0, 1.0, 1.0], crs, dtype=np.uint8)
+
+    with rasterio.open(TEST_FILE) as src:
+        assert src.overviews(1) == [2, 4]
+        assert np.array_equal(src.read(), np.moveaxis(array, -1, 0))
+
+def test_save_geotiff_removes_tmp_file_on_failure(setup_test_dir, monkeypatch):
+    import utils.file_io
+
+    def fail_copy(src, dst):
+        dst.write(b"partial")
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(utils.file_io.shutil, "copyfileobj", fail_copy)
+    array = np.random.rand(20, 30).astype(np.float32)
+
+    with pytest.raises(OSError):
+        save_geotiff(array, TEST_FILE, [0.0, 0.0, 1.0, 1.0], CRS.from_epsg(4326))
+
+    assert not os.path.exists(f"{TEST_FILE}.tmp")
+    assert not os.path.exists(TEST_FILE)
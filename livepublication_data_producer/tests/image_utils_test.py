@@ -1,12 +1,15 @@
 import os
 import shutil
 import tempfile
+from datetime import date
+from unittest.mock import MagicMock, patch
 
 import numpy as np
 import pytest
 from rasterio import open as rio_open
 from rasterio.enums import Resampling
-from sentinelhub import CRS, BBox
+from sentinelhub import CRS, BBox, SHConfig
+from shapely.geometry import box as sh_box
 
 from utils.image_utils import (
     compute_ndvi,
@@ -28,6 +31,18 @@ def test_compute_ndvi():
     expected = (0.6 - 0.2) / (0.6 + 0.2 + 1e-6)
     assert np.allclose(ndvi, expected)
 
+def test_compute_ndvi_writes_into_preallocated_float32():
+    stitched = np.zeros((2, 2, 4), dtype=np.float32)
+    stitched[..., 2] = 0.2  # Red
+    stitched[..., 3] = 0.6  # NIR
+    stitched[0, 0, 2] = -5.0  # Out-of-range value should be clipped
+    out = np.empty((2, 2), dtype=np.float32)
+    ndvi = compute_ndvi(stitched, out=out)
+    assert ndvi is out
+    assert ndvi.dtype == np.float32
+    assert ndvi[0, 0] == -1.0
+    assert np.isclose(ndvi[1, 1], 0.5)
+
 def test_rasterize_true_color():
     stitched = np.zeros((2, 2, 4))
     stitched[..., 0] = 0.1  # Blue
@@ -37,6 +52,23 @@ def test_rasterize_true_color():
     assert rgb.shape == (2, 2, 3)
     assert np.all((rgb >= 0) & (rgb <= 1))
 
+def test_band_kernels_accept_uint16_digital_numbers():
+    reflectance = (np.random.rand(3, 3, 4) * 0.5 + 0.05).astype(np.float32)
+    digital_numbers = np.round(reflectance * 10000).astype(np.uint16)
+    assert np.allclose(compute_ndvi(digital_numbers), compute_ndvi(reflectance), atol=1e-3)
+    assert np.allclose(rasterize_true_color(digital_numbers), rasterize_true_color(reflectance), atol=1e-3)
+
+def test_band_kernels_are_consistent_across_row_blocks(monkeypatch):
+    import utils.image_utils
+
+    stitched = np.random.rand(10, 3, 4)
+    full_ndvi = compute_ndvi(stitched)
+    full_rgb = rasterize_true_color(stitched)
+
+    monkeypatch.setattr(utils.image_utils, "BLOCK_ROWS", 3)
+    assert np.array_equal(compute_ndvi(stitched), full_ndvi)
+    assert np.array_equal(rasterize_true_color(stitched), full_rgb)
+
 def test_compute_stitched_bbox():
     tiles = [
         ("tile1.npy", BBox([1, 1, 2, 2], crs=CRS.WGS84)),
@@ -65,6 +97,65 @@ def test_stitch_tiles():
     finally:
         shutil.rmtree(temp_dir)
 
+def test_stitch_tiles_preserves_row_order():
+    temp_dir = tempfile.mkdtemp()
+    try:
+        tile_coords = []
+        for i, (x, y) in enumerate([(0, 0), (1, 0), (0, 1), (1, 1)]):
+            np.save(os.path.join(temp_dir, f"tile{i}.npy"), np.full((2, 2, 6), i, dtype=np.float32))
+            tile_coords.append((f"tile{i}.npy", BBox([x, y, x + 1, y + 1], CRS.WGS84)))
+
+        stitched = stitch_tiles(temp_dir, tile_coords)
+        assert stitched.shape == (4, 4, 6)
+        # Northern row first, western tile first within each row
+        assert stitched[0, 0, 0] == 2
+        assert stitched[0, 2, 0] == 3
+        assert stitched[2, 0, 0] == 0
+        assert stitched[2, 2, 0] == 1
+    finally:
+        shutil.rmtree(temp_dir)
+
+def test_stitch_tiles_with_recorded_shapes():
+    temp_dir = tempfile.mkdtemp()
+    try:
+        tile1 = np.ones((2, 2, 6), dtype=np.float32)
+        tile2 = np.ones((3, 2, 6), dtype=np.float32) * 2
+        np.save(os.path.join(temp_dir, "tile1.npy"), tile1)
+        np.save(os.path.join(temp_dir, "tile2.npy"), tile2)
+
+        tile_coords = [
+            ("tile1.npy", BBox([0, 0, 1, 1], CRS.WGS84), tile1.shape, tile1.dtype),
+            ("tile2.npy", BBox([1, 0, 2, 1], CRS.WGS84), tile2.shape, tile2.dtype)
+        ]
+
+        stitched = stitch_tiles(temp_dir, tile_coords)
+        assert stitched.shape == (3, 4, 6)
+    finally:
+        shutil.rmtree(temp_dir)
+
+def test_stitch_tiles_streams_to_output_path():
+    temp_dir = tempfile.mkdtemp()
+    try:
+        np.save(os.path.join(temp_dir, "south_west.npy"), np.ones((2, 2, 6), dtype=np.float32))
+        np.save(os.path.join(temp_dir, "south_east.npy"), np.ones((2, 2, 6), dtype=np.float32))
+        np.save(os.path.join(temp_dir, "north.npy"), np.full((2, 2, 6), 3, dtype=np.float32))
+
+        tile_coords = [
+            ("south_west.npy", BBox([0, 0, 1, 1], CRS.WGS84)),
+            ("south_east.npy", BBox([1, 0, 2, 1], CRS.WGS84)),
+            ("north.npy", BBox([0, 1, 1, 2], CRS.WGS84)),
+        ]
+        output_path = os.path.join(temp_dir, "stitched.npy")
+
+        stitched = stitch_tiles(temp_dir, tile_coords, output_path=output_path)
+        assert stitched.shape == (4, 4, 6)
+        assert stitched.dtype == np.float32
+        # Narrower northern row is stretched to the full mosaic width
+        assert np.all(stitched[:2] == 3)
+        assert np.array_equal(np.load(output_path), stitched)
+    finally:
+        shutil.rmtree(temp_dir)
+
 def test_stitch_raw_tile_data():
     temp_dir = tempfile.mkdtemp()
     try:
@@ -158,12 +249,40 @@ def test_generate_true_color_products():
     finally:
         shutil.rmtree(temp_dir)
 
+from utils.image_utils import generate_imagery_products
+
+
+def test_generate_imagery_products_writes_both_products():
+    temp_dir = tempfile.mkdtemp()
+    try:
+        imagery_path = os.path.join(temp_dir, "imagery")
+        os.makedirs(imagery_path, exist_ok=True)
+        paths = {"imagery": imagery_path}
+
+        stitched_image = np.full((2, 2, 5), 0.2)  # [B02, B03, B04, B08, SCL]
+        stitched_image[..., 3] = 0.6
+        stitched_image[..., 4] = 1
+
+        tile_info = [("tile1.npy", BBox([0, 0, 1, 1], CRS.WGS84))]
+
+        generate_imagery_products(paths, tile_info, stitched_image)
+
+        for name in ("ndvi.png", "ndvi.tif", "true_color.png", "true_color.tif"):
+            assert os.path.exists(os.path.join(imagery_path, name))
+    finally:
+        shutil.rmtree(temp_dir)
+
 import json
 
 import rasterio
 from rasterio.transform import from_origin
 
 from utils.image_utils import validate_image_coverage_with_tile_footprints
+from utils.metadata_utils import (
+    discover_metadata_for_tiles,
+    select_orbits_for_tiles,
+    write_workflow_tile_metadata,
+)
 
 
 def test_validate_image_coverage_with_tile_footprints():
@@ -219,4 +338,47 @@ def test_validate_image_coverage_with_tile_footprints():
 
         assert os.path.exists(output_png_path)
     finally:
-        shutil.rmtree(temp_dir)
\ No newline at end of file
+        shutil.rmtree(temp_dir)
+@patch("utils.metadata_utils.get_pooled_catalog")
+def test_validate_image_coverage_with_pipeline_selected_orbit(mock_get_catalog):
+    temp_dir = tempfile.mkdtemp()
+    try:
+        paths = {"metadata": os.path.join(temp_dir, "metadata")}
+        stitched_path = os.path.join(temp_dir, "true_color.tif")
+        output_png_path = os.path.join(temp_dir, "diagnostic.png")
+
+        class DummyProfile:
+            region = "Test Region"
+            time_interval = (date(2022, 1, 1), date(2022, 1, 2))
+            orbit_selection_strategy = "least_cloud"
+
+        # Selected orbit written by the Catalog-based discovery and selection steps
+        tiles = [BBox([149.75, -37.31, 149.76, -37.30], crs=CRS.WGS84)]
+        mock_catalog = MagicMock()
+        mock_catalog.search.return_value = iter([{
+            "id": "S2A_MSIL2A_20220101T235251_N0301_R130_T55HFA_20220102T014255",
+            "geometry": sh_box(149.70, -37.35, 149.80, -37.25).__geo_interface__,
+            "properties": {"datetime": "2022-01-01T23:59:00Z", "eo:cloud_cover": 5.0},
+        }])
+        mock_get_catalog.return_value = mock_catalog
+        write_workflow_tile_metadata(paths=paths, tiles=tiles)
+        metadata_by_tile = discover_metadata_for_tiles(paths, tiles, DummyProfile(), SHConfig())
+        select_orbits_for_tiles(paths, metadata_by_tile, DummyProfile())
+
+        data = np.ones((3, 2, 2), dtype=np.uint8) * 100
+        transform = from_origin(149.75, -37.30, 0.005, 0.005)
+        with rasterio.open(
+            stitched_path, 'w', driver='GTiff', height=2, width=2, count=3,
+            dtype='uint8', crs='EPSG:4326', transform=transform
+        ) as dst:
+            dst.write(data)
+
+        validate_image_coverage_with_tile_footprints(
+            stitched_image_path=stitched_path,
+            selected_orbit_path=os.path.join(paths["metadata"], "test_region_tile0_selected_orbit.json"),
+            output_path=output_png_path
+        )
+
+        assert os.path.exists(output_png_path)
+    finally:
+        shutil.rmtree(temp_dir)
@@ -7,9 +7,13 @@ from utils.job_utils import (
     archive_job_outputs,
     generate_job_id,
     get_job_output_paths,
+    get_metadata_cache_path,
     get_orbit_metadata_path,
     get_stitched_array_path,
     get_tile_prefix,
+    get_tile_prefixes,
+    is_job_complete,
+    mark_job_complete,
     prepare_job_output_dirs,
 )
 
@@ -109,6 +113,8 @@ def test_get_tile_prefix():
     prefix2 = get_tile_prefix(config, 5)
     assert prefix2 == "canterbury_plains_tile5"
 
+    assert get_tile_prefixes(config, 6) == [get_tile_prefix(config, idx) for idx in range(6)]
+
 def test_get_orbit_metadata_path():
     paths = {
         "metadata": "outputs/test_region__20230101_20230131/metadata"
@@ -123,3 +129,23 @@ def test_get_stitched_array_path():
     }
     expected_path = os.path.join(paths["stitched"], "stitched_raw_bands.npy")
     assert get_stitched_array_path(paths) == expected_path
+
+def test_get_metadata_cache_path():
+    paths = {
+        "metadata": "outputs/test_region__20230101_20230131/metadata"
+    }
+    expected_path = os.path.join(paths["metadata"], ".cache", "abc123.json")
+    assert get_metadata_cache_path(paths, "abc123") == expected_path
+
+def test_is_job_complete_requires_marker_and_products(tmp_path):
+    paths = {"base": str(tmp_path), "imagery": str(tmp_path / "imagery")}
+    os.makedirs(paths["imagery"])
+    assert not is_job_complete(paths)
+
+    mark_job_complete(paths)
+    assert not is_job_complete(paths)  # Marker alone is not enough
+
+    for product in ("ndvi.tif", "true_color.tif"):
+        with open(os.path.join(paths["imagery"], product), "wb") as f:
+            f.write(b"tif")
+    assert is_job_complete(paths)
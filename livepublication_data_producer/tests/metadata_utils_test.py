@@ -2,17 +2,26 @@ import json
 import os
 import tempfile
 from datetime import date
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
+import requests
+from pyproj import Transformer
 from sentinelhub import BBox, SHConfig
+from sentinelhub.exceptions import DownloadFailedException
 from shapely.geometry import Polygon, box
+from shapely.ops import unary_union
 
 from utils.metadata_utils import (
+    _avg_cloud_per_orbit,
+    _filter_orbits_by_coverage,
+    _index_geometries_by_tile,
+    _orbits_from_entries,
+    _scene_tile_entry,
+    _search_catalog_scenes,
     compute_orbit_bbox,
     discover_metadata_for_tiles,
     discover_orbit_data_metadata,
-    discover_orbit_metadata,
     has_valid_orbits,
     select_best_orbit,
     select_orbits_for_tiles,
@@ -51,51 +60,36 @@ def test_compute_orbit_bbox_with_valid_tiles():
     assert result.bounds == polygon.bounds
     assert result.contains(polygon)
 
+def test_compute_orbit_bbox_reprojects_utm_footprints():
+    # UTM zone 55S footprint with a hole, reprojected to WGS84
+    outer = [(600000, 5870000), (610000, 5870000), (610000, 5880000), (600000, 5880000), (600000, 5870000)]
+    hole = [(602000, 5872000), (604000, 5872000), (604000, 5874000), (602000, 5874000), (602000, 5872000)]
+    orbit = {
+        "tiles": [
+            {
+                "dataGeometry": {
+                    "type": "Polygon",
+                    "crs": {"type": "name", "properties": {"name": "EPSG:32755"}},
+                    "coordinates": [outer, hole]
+                }
+            }
+        ]
+    }
+
+    transformer = Transformer.from_crs("EPSG:32755", "EPSG:4326", always_xy=True)
+    expected = Polygon(
+        [transformer.transform(x, y) for x, y in outer],
+        [[transformer.transform(x, y) for x, y in hole]]
+    )
+    result = compute_orbit_bbox(orbit)
+    assert len(result.interiors) == 1
+    assert result.equals_exact(expected, tolerance=1e-9)
+
 def test_compute_orbit_bbox_with_no_tiles():
     orbit = {"tiles": []}
     with pytest.raises(ValueError, match="No valid geometries found in orbit."):
         compute_orbit_bbox(orbit)
 
-@patch("utils.metadata_utils.SentinelHubRequest")
-def test_discover_orbit_metadata(mock_request_cls):
-    temp_dir = tempfile.mkdtemp()
-    try:
-        paths = {"metadata": os.path.join(temp_dir, "metadata")}
-        os.makedirs(paths["metadata"], exist_ok=True)
-
-        bbox = BBox(bbox=[149.75, -37.31, 149.76, -37.30], crs="EPSG:4326")
-        time_interval = (date(2022, 1, 1), date(2022, 1, 2))
-        config = SHConfig()
-        evalscript = "// dummy evalscript"
-        prefix = "test_tile"
-
-        mock_response = {"userdata.json": {"orbit_id": "orbit123"}}
-        mock_request_instance = MagicMock()
-        mock_request_instance.get_data.return_value = [mock_response]
-        mock_request_cls.return_value = mock_request_instance
-
-        metadata = discover_orbit_metadata(
-            paths=paths,
-            tile=bbox,
-            time_interval=time_interval,
-            config=config,
-            evalscript=evalscript,
-            prefix=prefix,
-        )
-
-        expected_path = os.path.join(paths["metadata"], "test_tile_orbit_metadata.json")
-        assert os.path.exists(expected_path)
-
-        with open(expected_path) as f:
-            saved = json.load(f)
-        assert saved["orbit_id"] == "orbit123"
-        assert "tile_bbox" in saved
-        assert saved["tile_bbox"] == list(bbox)
-
-    finally:
-        import shutil
-        shutil.rmtree(temp_dir)
-
 def test_select_best_orbit_least_cloud():
     class DummyProfile:
         orbit_selection_strategy = "least_cloud"
@@ -121,9 +115,9 @@ def test_select_best_orbit_least_cloud():
         ]
     }
 
-    # Inject compute_orbit_bbox patch to simulate full tile coverage
-    with patch("utils.metadata_utils.compute_orbit_bbox") as mock_bbox:
-        mock_bbox.return_value = box(149.75, -37.31, 149.76, -37.30)  # Perfect match
+    # Inject tile footprints that simulate full tile coverage
+    with patch("utils.metadata_utils._orbit_tile_geometries") as mock_geometries:
+        mock_geometries.return_value = [box(149.75, -37.31, 149.76, -37.30)]  # Perfect match
         tile_bbox = [149.75, -37.31, 149.76, -37.30]
         result = select_best_orbit(metadata, DummyProfile(), tile_bbox)
 
@@ -133,6 +127,32 @@ def test_select_best_orbit_least_cloud():
     assert result["product_ids"] == ["C", "D"]
     assert result["tile_ids"] == [3, 4]
 
+def test_filter_orbits_by_coverage_rejects_on_envelope_before_union():
+    def wgs84_tile(min_x, min_y, max_x, max_y):
+        return {"dataGeometry": {"crs": {"type": "name", "properties": {"name": "EPSG:4326"}},
+                                 **box(min_x, min_y, max_x, max_y).__geo_interface__}}
+
+    tile_bbox = [0.0, 0.0, 1.0, 1.0]
+    metadata = {"orbits": [
+        {"dateFrom": "far", "tiles": [wgs84_tile(5.0, 5.0, 6.0, 6.0)]},
+        {"dateFrom": "partial", "tiles": [wgs84_tile(0.0, 0.0, 0.5, 1.0)]},
+        {"dateFrom": "covering", "tiles": [wgs84_tile(-0.1, -0.1, 0.6, 1.1), wgs84_tile(0.5, -0.1, 1.1, 1.1)]},
+    ]}
+
+    with patch("utils.metadata_utils.unary_union", wraps=unary_union) as mock_union:
+        filtered = _filter_orbits_by_coverage(metadata, tile_bbox)
+
+    assert [orbit["dateFrom"] for orbit in filtered] == ["covering"]
+    assert mock_union.call_count == 1  # Only the orbit whose envelope covers the tile
+
+def test_avg_cloud_per_orbit():
+    orbits = [
+        {"tiles": [{"cloudCoverage": 50.0}, {"cloudCoverage": 40.0}]},
+        {"tiles": []},
+        {"tiles": [{"cloudCoverage": 20.0}, {}]},
+    ]
+    assert _avg_cloud_per_orbit(orbits).tolist() == [45.0, 100.0, 60.0]
+
 def test_write_selected_orbit_creates_json_file():
     temp_dir = tempfile.mkdtemp()
     try:
@@ -146,6 +166,7 @@ def test_write_selected_orbit_creates_json_file():
             "orbit": {"tiles": []}
         }
         prefix = "test_tile"
+        os.makedirs(paths["metadata"], exist_ok=True)
 
         write_selected_orbit(paths, orbit_data, prefix)
 
@@ -160,13 +181,53 @@ def test_write_selected_orbit_creates_json_file():
         import shutil
         shutil.rmtree(temp_dir)
 
-@patch("utils.metadata_utils.discover_orbit_metadata")
-@patch("utils.metadata_utils.get_orbit_metadata_path")
-def test_discover_metadata_for_tiles(mock_get_metadata_path, mock_discover_metadata):
+@patch("utils.metadata_utils.get_pooled_catalog")
+def test_search_catalog_scenes_reuses_fresh_cache(mock_get_catalog):
     temp_dir = tempfile.mkdtemp()
     try:
         paths = {"metadata": os.path.join(temp_dir, "metadata")}
         os.makedirs(paths["metadata"], exist_ok=True)
+        geometry = {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]]}
+        scenes = [{"id": "S2_SCENE", "geometry": geometry, "properties": {}}]
+        mock_catalog = MagicMock()
+        mock_catalog.search.side_effect = lambda **_: iter(scenes)
+        mock_get_catalog.return_value = mock_catalog
+
+        kwargs = dict(
+            paths=paths,
+            search_bbox=BBox(bbox=[149.75, -37.31, 149.76, -37.30], crs="EPSG:4326"),
+            time_interval=(date(2022, 1, 1), date(2022, 1, 2)),
+            config=SHConfig(),
+            cache_ttl=3600,
+        )
+
+        first = _search_catalog_scenes(**kwargs)
+        second = _search_catalog_scenes(**kwargs)
+        assert mock_catalog.search.call_count == 1
+        assert first == second
+
+        # An expired cache entry triggers a fresh search
+        _search_catalog_scenes(**{**kwargs, "cache_ttl": 0})
+        assert mock_catalog.search.call_count == 2
+
+        # LP_NO_CACHE bypasses even a fresh entry
+        with patch("utils.metadata_utils.METADATA_CACHE_DISABLED", True):
+            _search_catalog_scenes(**kwargs)
+        assert mock_catalog.search.call_count == 3
+
+        # Without a TTL nothing is cached
+        _search_catalog_scenes(**{**kwargs, "cache_ttl": None})
+        assert mock_catalog.search.call_count == 4
+
+    finally:
+        import shutil
+        shutil.rmtree(temp_dir)
+
+@patch("utils.metadata_utils.get_pooled_catalog")
+def test_discover_metadata_for_tiles(mock_get_catalog):
+    temp_dir = tempfile.mkdtemp()
+    try:
+        paths = {"metadata": os.path.join(temp_dir, "metadata")}
 
         # Prepare mock tile BBoxes
         tiles = [
@@ -179,34 +240,72 @@ def test_discover_metadata_for_tiles(mock_get_metadata_path, mock_discover_metad
             region = "Test Region"
             time_interval = (date(2022, 1, 1), date(2022, 1, 2))
 
-        config = SHConfig()
-        evalscript = "// dummy evalscript"
+        def scene(scene_id, datetime, cloud, bounds):
+            return {
+                "id": scene_id,
+                "geometry": box(*bounds).__geo_interface__,
+                "properties": {"datetime": datetime, "eo:cloud_cover": cloud},
+            }
 
-        # Write dummy metadata files to simulate discover_orbit_metadata output
-        for i, tile in enumerate(tiles):
-            prefix = f"test_region_tile{i}"
-            metadata = {"orbit_id": f"orbit_{i}"}
-            metadata_path = os.path.join(paths["metadata"], f"{prefix}_orbit_metadata.json")
-            with open(metadata_path, "w") as f:
-                json.dump(metadata, f)
-            mock_get_metadata_path.side_effect = lambda paths, p=prefix: os.path.join(paths["metadata"], f"{p}_orbit_metadata.json")
+        # One scene covers both tiles, the other only the eastern tile
+        mock_catalog = MagicMock()
+        mock_catalog.search.return_value = iter([
+            scene("S2_BOTH", "2022-01-02T10:00:00Z", 10.0, [149.70, -37.35, 149.80, -37.25]),
+            scene("S2_EAST", "2022-01-01T10:00:00Z", 30.0, [149.765, -37.35, 149.80, -37.25]),
+        ])
+        mock_get_catalog.return_value = mock_catalog
 
         result = discover_metadata_for_tiles(
             paths=paths,
             tiles=tiles,
             profile=DummyProfile(),
-            config=config,
-            evalscript=evalscript
+            config=SHConfig()
         )
 
+        assert mock_catalog.search.call_count == 1
         assert list(result.keys()) == ["test_region_tile0", "test_region_tile1"]
-        assert result["test_region_tile0"]["orbit_id"] == "orbit_0"
-        assert result["test_region_tile1"]["orbit_id"] == "orbit_1"
+
+        west_orbits = result["test_region_tile0"]["orbits"]
+        assert [tile["productId"] for orbit in west_orbits for tile in orbit["tiles"]] == ["S2_BOTH"]
+
+        east_orbits = result["test_region_tile1"]["orbits"]
+        assert [orbit["dateFrom"][:10] for orbit in east_orbits] == ["2022-01-01", "2022-01-02"]
+        assert east_orbits[0]["tiles"][0]["cloudCoverage"] == 30.0
+        # Scenes spanning several tiles are held once, not copied per tile
+        assert east_orbits[1]["tiles"][0] is west_orbits[0]["tiles"][0]
+        assert compute_orbit_bbox(east_orbits[0]).bounds == (149.765, -37.35, 149.80, -37.25)
+
+        with open(os.path.join(paths["metadata"], "test_region_tile1_orbit_metadata.json")) as f:
+            saved = json.load(f)
+        assert saved["tile_bbox"] == tiles[1]
+        assert [orbit["dateFrom"] for orbit in saved["orbits"]] == [orbit["dateFrom"] for orbit in east_orbits]
 
     finally:
         import shutil
         shutil.rmtree(temp_dir)
 
+def test_orbits_from_entries_separates_same_day_datatakes():
+    def entry(scene_id, datetime):
+        footprint = box(149.70, -37.35, 149.80, -37.25)
+        scene = {
+            "id": scene_id,
+            "geometry": footprint.__geo_interface__,
+            "properties": {"datetime": datetime, "eo:cloud_cover": 10.0},
+        }
+        return _scene_tile_entry(scene, footprint)
+
+    entries = [
+        entry("S2B_MSIL2A_20220101T001109_N0301_R073_T55HFA_20220101T020113", "2022-01-01T00:15:00Z"),
+        entry("S2A_MSIL2A_20220101T235251_N0301_R130_T55HFA_20220102T014255", "2022-01-01T23:59:00Z"),
+        entry("S2A_MSIL2A_20220101T235251_N0301_R130_T55HGA_20220102T014255", "2022-01-01T23:59:05Z"),
+    ]
+
+    orbits = _orbits_from_entries(entries)
+
+    assert [orbit["datatake"] for orbit in orbits] == ["S2B_20220101T001109_R073", "S2A_20220101T235251_R130"]
+    assert [tile["tileId"] for tile in orbits[1]["tiles"]] == ["55HFA", "55HGA"]
+    assert (orbits[1]["dateFrom"], orbits[1]["dateTo"]) == ("2022-01-01T23:59:00Z", "2022-01-01T23:59:05Z")
+
 @patch("utils.metadata_utils.select_best_orbit")
 @patch("utils.metadata_utils.write_selected_orbit")
 def test_select_orbits_for_tiles(mock_write_orbit, mock_select_orbit):
@@ -254,8 +353,8 @@ def test_select_orbits_for_tiles(mock_write_orbit, mock_select_orbit):
         import shutil
         shutil.rmtree(temp_dir)
 
-@patch("utils.metadata_utils.SentinelHubCatalog")
-def test_discover_orbit_data_metadata(mock_catalog_cls):
+@patch("utils.metadata_utils.get_pooled_catalog")
+def test_discover_orbit_data_metadata(mock_get_catalog):
     temp_dir = tempfile.mkdtemp()
     try:
         paths = {"metadata": os.path.join(temp_dir, "metadata")}
@@ -275,8 +374,8 @@ def test_discover_orbit_data_metadata(mock_catalog_cls):
 
         # Mock catalog responses
         mock_catalog = MagicMock()
-        mock_catalog.search.side_effect = lambda collection, ids: [{"id": ids[0], "mock": True}]
-        mock_catalog_cls.return_value = mock_catalog
+        mock_catalog.search.side_effect = lambda collection, ids: [{"id": i, "mock": True} for i in ids]
+        mock_get_catalog.return_value = mock_catalog
 
         config = SHConfig()
         result = discover_orbit_data_metadata(paths, config)
@@ -296,6 +395,70 @@ def test_discover_orbit_data_metadata(mock_catalog_cls):
         import shutil
         shutil.rmtree(temp_dir)
 
+@patch("utils.metadata_utils.get_pooled_catalog")
+def test_discover_orbit_data_metadata_uses_in_memory_orbits(mock_get_catalog):
+    temp_dir = tempfile.mkdtemp()
+    try:
+        paths = {"metadata": temp_dir}
+        selected_orbits = {
+            "tile0": {"product_ids": ["A", "B"]},
+            "tile1": {"product_ids": ["B"]},
+        }
+        mock_catalog = MagicMock()
+        mock_catalog.search.side_effect = lambda collection, ids: [{"id": i} for i in ids]
+        mock_get_catalog.return_value = mock_catalog
+
+        # No *_selected_orbit.json files exist, so products can only come from the mapping
+        result = discover_orbit_data_metadata(paths, SHConfig(), selected_orbits=selected_orbits)
+
+        assert set(result) == {"A", "B"}
+        mock_catalog.search.assert_called_once_with(collection=ANY, ids=["A", "B"])
+    finally:
+        import shutil
+        shutil.rmtree(temp_dir)
+
+def _download_failed(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return DownloadFailedException(
+        f"{status_code} error", request_exception=requests.HTTPError(response=response)
+    )
+
+@patch("utils.metadata_utils.get_pooled_catalog")
+def test_discover_orbit_data_metadata_retries_failed_batch_per_id(mock_get_catalog):
+    temp_dir = tempfile.mkdtemp()
+    try:
+        def search(collection, ids):
+            if "BAD" in ids:
+                raise _download_failed(400)
+            return [{"id": i} for i in ids]
+
+        mock_get_catalog.return_value.search.side_effect = search
+        selected_orbits = {"tile0": {"product_ids": ["A", "BAD", "C"]}}
+
+        result = discover_orbit_data_metadata({"metadata": temp_dir}, SHConfig(), selected_orbits=selected_orbits)
+
+        assert list(result) == ["A", "C"]
+    finally:
+        import shutil
+        shutil.rmtree(temp_dir)
+
+@patch("utils.metadata_utils.get_pooled_catalog")
+def test_discover_orbit_data_metadata_does_not_split_batch_on_server_error(mock_get_catalog):
+    temp_dir = tempfile.mkdtemp()
+    try:
+        mock_catalog = mock_get_catalog.return_value
+        mock_catalog.search.side_effect = _download_failed(503)
+        selected_orbits = {"tile0": {"product_ids": ["A", "B", "C"]}}
+
+        result = discover_orbit_data_metadata({"metadata": temp_dir}, SHConfig(), selected_orbits=selected_orbits)
+
+        assert result == {}
+        mock_catalog.search.assert_called_once_with(collection=ANY, ids=["A", "B", "C"])
+    finally:
+        import shutil
+        shutil.rmtree(temp_dir)
+
 def test_has_valid_orbits_true_and_false_cases():
     valid_metadata = {
         "tile1": {"orbits": [{"orbit_id": "A"}]},
@@ -333,3 +496,24 @@ def test_write_workflow_tile_metadata_creates_expected_file():
     finally:
         import shutil
         shutil.rmtree(temp_dir)
+
+def test_index_geometries_by_tile():
+    tile_boxes = [box(0, 0, 1, 1), box(1, 0, 2, 1), box(2, 0, 3, 1)]
+    geometries = [box(0.5, 0.2, 1.5, 0.8), box(2.2, 0.2, 2.8, 0.8), box(5, 5, 6, 6)]
+
+    assert _index_geometries_by_tile(tile_boxes, geometries) == [[0], [0], [1]]
+    assert _index_geometries_by_tile(tile_boxes, []) == [[], [], []]
+
+def test_select_best_orbit_rejects_unimplemented_and_unknown_strategies():
+    metadata = {"orbits": [{"dateFrom": "2022-01-01T00:00:00Z", "tiles": []}]}
+
+    class PlannedProfile:
+        orbit_selection_strategy = "max_coverage"
+
+    class UnknownProfile:
+        orbit_selection_strategy = "most_pixels"
+
+    with pytest.raises(NotImplementedError):
+        select_best_orbit(metadata, PlannedProfile(), [0, 0, 1, 1])
+    with pytest.raises(ValueError, match="Unknown orbit selection strategy"):
+        select_best_orbit(metadata, UnknownProfile(), [0, 0, 1, 1])
@@ -7,7 +7,7 @@ import numpy as np
 import rasterio
 from rasterio.transform import from_origin
 
-from utils.plotting import plot_image, plot_tile_product_overlay
+from utils.plotting import plot_image, plot_tile_product_overlay, read_rgb_preview
 
 
 def test_plot_image_saves_file_and_clipping():
@@ -23,6 +23,19 @@ def test_plot_image_saves_file_and_clipping():
     finally:
         shutil.rmtree(temp_dir)
 
+def test_plot_image_save_only_keeps_native_resolution():
+    temp_dir = tempfile.mkdtemp()
+    try:
+        rgb = np.random.rand(40, 30, 3) * 1.5  # Out-of-range values are clipped, not rejected
+        save_path = os.path.join(temp_dir, "rgb.png")
+
+        plot_image(image=rgb, save_path=save_path)
+
+        with rasterio.open(save_path) as src:
+            assert (src.height, src.width) == (40, 30)
+    finally:
+        shutil.rmtree(temp_dir)
+
 def test_plot_tile_product_overlay_generates_png():
     temp_dir = tempfile.mkdtemp()
     try:
@@ -62,3 +75,25 @@ def test_plot_tile_product_overlay_generates_png():
         assert os.path.exists(output_path)
     finally:
         shutil.rmtree(temp_dir)
+
+def test_read_rgb_preview_downsamples_and_keeps_georeferencing():
+    temp_dir = tempfile.mkdtemp()
+    try:
+        test_img_path = os.path.join(temp_dir, "true_color.tif")
+        data = np.arange(3 * 40 * 20, dtype=np.uint8).reshape(3, 40, 20)
+        transform = from_origin(100, 50, 0.5, 0.5)
+        with rasterio.open(
+            test_img_path, "w", driver="GTiff", height=40, width=20, count=3, dtype=data.dtype, transform=transform
+        ) as dst:
+            dst.write(data)
+
+        with rasterio.open(test_img_path) as src:
+            preview, preview_transform = read_rgb_preview(src, max_dim=10)
+            full, full_transform = read_rgb_preview(src, max_dim=40)
+
+        assert preview.shape == (3, 10, 5)
+        assert preview_transform * (5, 10) == transform * (20, 40)  # Same footprint, coarser pixels
+        assert full.shape == (3, 40, 20)
+        assert full_transform == transform
+    finally:
+        shutil.rmtree(temp_dir)
@@ -0,0 +1,59 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from sentinelhub import SentinelHubCatalog, SHConfig
+
+from utils.session_utils import (
+    PooledSentinelHubDownloadClient,
+    get_http_session,
+    get_pooled_catalog,
+    get_sh_config,
+)
+
+
+def test_get_http_session_is_shared():
+    session = get_http_session()
+    assert session is get_http_session()
+    assert session.get_adapter("https://sh.dataspace.copernicus.eu")._pool_maxsize >= 8
+
+@patch("utils.session_utils.get_http_session")
+def test_pooled_client_uses_shared_session(mock_get_session):
+    client = PooledSentinelHubDownloadClient()
+    request = MagicMock()
+    request.request_type.value = "POST"
+    request.url = "https://example.com/process"
+    request.post_values = {"a": 1}
+
+    with patch.object(client, "_prepare_headers", return_value={"h": "v"}):
+        client._do_download(request)
+
+    mock_get_session.return_value.request.assert_called_once_with(
+        "POST",
+        url="https://example.com/process",
+        json={"a": 1},
+        headers={"h": "v"},
+        timeout=client.config.download_timeout_seconds,
+    )
+
+def test_get_pooled_catalog_keeps_retry_time():
+    catalog = get_pooled_catalog(SHConfig())
+
+    assert isinstance(catalog.client, PooledSentinelHubDownloadClient)
+    assert catalog.client.default_retry_time == SentinelHubCatalog(config=SHConfig()).client.default_retry_time
+    assert catalog.client.config is catalog.config
+
+def test_get_sh_config_reads_secrets_once(tmp_path):
+    secrets_path = tmp_path / "secrets.json"
+    secrets_path.write_text(json.dumps({
+        "sh_client_id": "id",
+        "sh_client_secret": "secret",
+        "sh_base_url": "https://sh.dataspace.copernicus.eu",
+        "sh_token_url": "https://identity.dataspace.copernicus.eu/token",
+    }))
+
+    config = get_sh_config(str(secrets_path))
+    secrets_path.unlink()  # A second call must not touch the file again
+
+    assert get_sh_config(str(secrets_path)) is config
+    assert config.sh_client_id == "id"
+    assert config.sh_base_url == "https://sh.dataspace.copernicus.eu"
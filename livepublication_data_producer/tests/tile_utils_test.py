@@ -25,6 +25,9 @@ def test_generate_safe_tiles_creates_expected_tiles():
         assert isinstance(tiles, list)
         assert all(isinstance(tile, BBox) for tile in tiles)
         assert len(tiles) > 0
+        assert all(tile.max_x > tile.min_x and tile.max_y > tile.min_y for tile in tiles)
+        assert min(tile.min_x for tile in tiles) == aoi[0]
+        assert max(tile.max_y for tile in tiles) == aoi[3]
 
         metadata_path = os.path.join(paths["metadata"], "workflow_tile_metadata.json")
         assert os.path.exists(metadata_path)
@@ -62,14 +65,16 @@ def test_download_safe_tiles_with_mocked_request(mock_request_cls):
         assert len(tile_info) == 1
         assert len(failed) == 0
         assert tile_info[0][0].endswith(".npy")
+        assert tile_info[0][2] == dummy_data.shape
+        assert tile_info[0][3] == dummy_data.dtype
         assert os.path.exists(os.path.join(paths["raw_tiles"], tile_info[0][0]))
 
     finally:
         import shutil
         shutil.rmtree(temp_dir)
 
-@patch("utils.tile_utils.download_safe_tiles")
-def test_download_orbits_for_tiles_with_mocked_download(mock_download_safe_tiles):
+@patch("utils.tile_utils._fetch_and_save_tile")
+def test_download_orbits_for_tiles_with_mocked_download(mock_fetch_and_save_tile):
     temp_dir = tempfile.mkdtemp()
     try:
         paths = {"raw_tiles": os.path.join(temp_dir, "raw_tiles")}
@@ -88,8 +93,8 @@ def test_download_orbits_for_tiles_with_mocked_download(mock_download_safe_tiles
         class DummyProfile:
             region = "Test Region"
 
-        dummy_data = [("test_region_tile0_000.npy", tiles[0])]
-        mock_download_safe_tiles.return_value = (dummy_data, [])
+        dummy_data = ("test_region_tile0_000.npy", tiles[0])
+        mock_fetch_and_save_tile.return_value = (dummy_data, None)
 
         config = SHConfig()
         evalscript = "// mock evalscript"
@@ -111,6 +116,32 @@ def test_download_orbits_for_tiles_with_mocked_download(mock_download_safe_tiles
         import shutil
         shutil.rmtree(temp_dir)
 
+@patch("utils.tile_utils._fetch_and_save_tile")
+def test_download_orbits_for_tiles_with_no_tiles(mock_fetch_and_save_tile):
+    temp_dir = tempfile.mkdtemp()
+    try:
+        paths = {"raw_tiles": os.path.join(temp_dir, "raw_tiles")}
+
+        class DummyProfile:
+            region = "Test Region"
+
+        tile_info, failed = download_orbits_for_tiles(
+            paths=paths,
+            tiles=[],
+            selected_orbits={},
+            profile=DummyProfile(),
+            config=SHConfig(),
+            evalscript="// mock evalscript"
+        )
+
+        assert tile_info == []
+        assert failed == []
+        mock_fetch_and_save_tile.assert_not_called()
+
+    finally:
+        import shutil
+        shutil.rmtree(temp_dir)
+
 def test_convert_tiles_to_bboxes_creates_bboxes():
     tile_coords_list = [
         [149.75, -37.31, 149.76, -37.30],
@@ -123,3 +154,93 @@ def test_convert_tiles_to_bboxes_creates_bboxes():
     assert len(bboxes) == 2
     assert bboxes[0].lower_left == (149.75, -37.31)
     assert bboxes[1].upper_right == (149.77, -37.30)
+
+@patch("utils.tile_utils.SentinelHubRequest")
+def test_download_safe_tiles_rejects_all_zero_data(mock_request_cls):
+    temp_dir = tempfile.mkdtemp()
+    try:
+        paths = {"raw_tiles": os.path.join(temp_dir, "raw_tiles")}
+        tiles = [BBox([149.75, -37.31, 149.76, -37.30], crs=CRS.WGS84)]
+
+        mock_request = MagicMock()
+        mock_request.get_data.return_value = [np.zeros((10, 10, 3), dtype=np.float32)]
+        mock_request_cls.return_value = mock_request
+
+        tile_info, failed = download_safe_tiles(
+            paths=paths,
+            tiles=tiles,
+            time_interval=("2022-01-01", "2022-01-02"),
+            prefix="testprefix",
+            config=SHConfig(),
+            evalscript="// fake evalscript"
+        )
+
+        assert tile_info == []
+        assert failed == [(0, tiles[0])]
+        assert os.listdir(paths["raw_tiles"]) == []
+
+    finally:
+        import shutil
+        shutil.rmtree(temp_dir)
+
+@patch("utils.tile_utils.SentinelHubRequest")
+def test_download_safe_tiles_keeps_tile_order(mock_request_cls):
+    temp_dir = tempfile.mkdtemp()
+    try:
+        paths = {"raw_tiles": os.path.join(temp_dir, "raw_tiles")}
+        tiles = [BBox([149.75 + i * 0.01, -37.31, 149.76 + i * 0.01, -37.30], crs=CRS.WGS84) for i in range(5)]
+
+        # Tile 1 comes back empty; requests may be constructed in any order across threads
+        def make_request(**kwargs):
+            data = np.zeros((4, 4, 3)) if kwargs["bbox"] == tiles[1] else np.ones((4, 4, 3))
+            return MagicMock(**{"get_data.return_value": [data]})
+        mock_request_cls.side_effect = make_request
+
+        tile_info, failed = download_safe_tiles(
+            paths=paths,
+            tiles=tiles,
+            time_interval=("2022-01-01", "2022-01-02"),
+            prefix="testprefix",
+            config=SHConfig(),
+            evalscript="// fake evalscript",
+            max_workers=3
+        )
+
+        assert [info[0].split(".")[0] for info in tile_info] == [
+            "testprefix_000", "testprefix_002", "testprefix_003", "testprefix_004"
+        ]
+        assert [info[1] for info in tile_info] == [tiles[0], tiles[2], tiles[3], tiles[4]]
+        assert failed == [(1, tiles[1])]
+
+    finally:
+        import shutil
+        shutil.rmtree(temp_dir)
+
+@patch("utils.tile_utils.SentinelHubRequest")
+def test_download_safe_tiles_reuses_cached_tiles(mock_request_cls):
+    temp_dir = tempfile.mkdtemp()
+    try:
+        paths = {"raw_tiles": os.path.join(temp_dir, "raw_tiles")}
+        tiles = [BBox([149.75, -37.31, 149.76, -37.30], crs=CRS.WGS84)]
+        mock_request_cls.return_value = MagicMock(**{"get_data.return_value": [np.ones((4, 4, 3))]})
+        kwargs = dict(
+            paths=paths,
+            tiles=tiles,
+            time_interval=("2022-01-01", "2022-01-02"),
+            prefix="testprefix",
+            config=SHConfig(),
+        )
+
+        first, _ = download_safe_tiles(evalscript="// fake evalscript", **kwargs)
+        second, _ = download_safe_tiles(evalscript="// fake evalscript", **kwargs)
+        assert mock_request_cls.call_count == 1
+        assert second[0][0] == first[0][0]
+
+        # A different evalscript is a different request and must not hit the cache
+        third, _ = download_safe_tiles(evalscript="// other evalscript", **kwargs)
+        assert mock_request_cls.call_count == 2
+        assert third[0][0] != first[0][0]
+
+    finally:
+        import shutil
+        shutil.rmtree(temp_dir)
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from datetime import date
 
 from utils.job_utils import generate_job_id
@@ -20,10 +21,24 @@ def test_generate_time_intervals_with_monthly_mode():
     assert intervals[1] == (date(2023, 2, 1), date(2023, 2, 28))
     assert intervals[2] == (date(2023, 3, 1), date(2023, 3, 15))
 
+def test_generate_time_intervals_quarterly_from_month_end():
+    class DummyProfile:
+        time_interval = (date(2023, 1, 31), date(2023, 9, 30))
+        time_series_mode = "quarterly"
+        time_series_custom_intervals = None
+
+    intervals = generate_time_intervals(DummyProfile())
+    # Month-end starts clamp to shorter months, as relativedelta does
+    assert intervals == [
+        (date(2023, 1, 31), date(2023, 4, 29)),
+        (date(2023, 4, 30), date(2023, 7, 29)),
+        (date(2023, 7, 30), date(2023, 9, 30)),
+    ]
+
 def test_daterange_inclusive():
     start = date(2023, 1, 1)
     end = date(2023, 1, 3)
-    dates = daterange(start, end)
+    dates = list(daterange(start, end))
     assert dates == [date(2023, 1, 1), date(2023, 1, 2), date(2023, 1, 3)]
 
 # def test_create_timeseries_jobs_creates_unique_jobs():
@@ -41,3 +56,29 @@ def test_daterange_inclusive():
 #         assert job.time_interval[0].month in [1, 2]
 #         assert hasattr(job, "job_id")
 #         assert job.parent_job_id == generate_job_id(DummyProfile())
+
+def test_create_timeseries_jobs_copies_profile_per_interval():
+    @dataclass(slots=True, frozen=True)
+    class DummyProfile:
+        region: str
+        time_interval: tuple
+        time_series_mode: str = "monthly"
+        time_series_custom_intervals: list = None
+        job_id: str = None
+        parent_job_id: str = None
+
+        def __post_init__(self):
+            # Mirrors DataAcquisitionConfig, which derives a missing job_id on construction
+            if self.job_id is None:
+                object.__setattr__(self, "job_id", generate_job_id(self))
+
+    profile = DummyProfile(region="Test Region", time_interval=(date(2023, 1, 1), date(2023, 2, 15)))
+    jobs = create_timeseries_jobs(profile)
+
+    assert [job.time_interval for job in jobs] == [
+        (date(2023, 1, 1), date(2023, 1, 31)),
+        (date(2023, 2, 1), date(2023, 2, 15)),
+    ]
+    assert all(job.parent_job_id == generate_job_id(profile) for job in jobs)
+    assert len({job.job_id for job in jobs}) == 2
+    assert profile.time_interval == (date(2023, 1, 1), date(2023, 2, 15))
@@ -1,24 +1,65 @@
-from .file_io import clean_all_outputs, save_geotiff
-from .image_utils import (
-    compute_ndvi,
-    compute_stitched_bbox,
-    rasterize_true_color,
-    stitch_tiles,
-    validate_image_coverage_with_tile_footprints,
-)
-from .job_utils import (
-    generate_job_id,
-    get_job_output_paths,
-    get_orbit_metadata_path,
-    get_tile_prefix,
-    prepare_job_output_dirs,
-)
-from .metadata_utils import (
-    discover_orbit_metadata,
-    select_best_orbit,
-    write_selected_orbit,
-    write_workflow_tile_metadata,
-)
-from .plotting import plot_image, plot_tile_product_overlay
-from .tile_utils import generate_safe_tiles
-from .time_interval_utils import generate_time_intervals
+import importlib
+
+__all__ = [
+    "clean_all_outputs",
+    "save_geotiff",
+    "compute_ndvi",
+    "compute_stitched_bbox",
+    "rasterize_true_color",
+    "stitch_tiles",
+    "validate_image_coverage_with_tile_footprints",
+    "generate_job_id",
+    "get_job_output_paths",
+    "get_orbit_metadata_path",
+    "get_tile_prefix",
+    "get_tile_prefixes",
+    "prepare_job_output_dirs",
+    "discover_metadata_for_tiles",
+    "select_best_orbit",
+    "write_selected_orbit",
+    "write_workflow_tile_metadata",
+    "plot_image",
+    "plot_tile_product_overlay",
+    "generate_safe_tiles",
+    "generate_time_intervals",
+]
+
+# Public name -> submodule that defines it. Submodules are only imported on first
+# attribute access so that heavy dependencies (rasterio, cv2, matplotlib) are not
+# loaded by callers that never touch imagery.
+_EXPORTS = {
+    "clean_all_outputs": ".file_io",
+    "save_geotiff": ".file_io",
+    "compute_ndvi": ".image_utils",
+    "compute_stitched_bbox": ".image_utils",
+    "rasterize_true_color": ".image_utils",
+    "stitch_tiles": ".image_utils",
+    "validate_image_coverage_with_tile_footprints": ".image_utils",
+    "generate_job_id": ".job_utils",
+    "get_job_output_paths": ".job_utils",
+    "get_orbit_metadata_path": ".job_utils",
+    "get_tile_prefix": ".job_utils",
+    "get_tile_prefixes": ".job_utils",
+    "prepare_job_output_dirs": ".job_utils",
+    "discover_metadata_for_tiles": ".metadata_utils",
+    "select_best_orbit": ".metadata_utils",
+    "write_selected_orbit": ".metadata_utils",
+    "write_workflow_tile_metadata": ".metadata_utils",
+    "plot_image": ".plotting",
+    "plot_tile_product_overlay": ".plotting",
+    "generate_safe_tiles": ".tile_utils",
+    "generate_time_intervals": ".time_interval_utils",
+}
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # cache so later lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,22 @@
+from functools import lru_cache
+
+from pyproj import CRS, Transformer
+
+
+@lru_cache(maxsize=32)
+def get_transformer(
+        source_crs: str,
+        target_crs: str
+    ) -> Transformer:
+    """
+    Return an always_xy Transformer between two CRSs, built once per pair.
+    Building a Transformer resolves both CRS definitions through PROJ, which costs far more
+    than transforming a footprint; pyproj keeps a PROJ object per thread, so the cached
+    instance is safe to share.
+    Args:
+        source_crs (str): Source CRS in any form pyproj accepts (e.g. "EPSG:32755", WKT).
+        target_crs (str): Target CRS in any form pyproj accepts.
+    Returns:
+        Transformer: Cached transformer from source_crs to target_crs.
+    """
+    return Transformer.from_crs(CRS.from_user_input(source_crs), CRS.from_user_input(target_crs), always_xy=True)
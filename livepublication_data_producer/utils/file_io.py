@@ -3,20 +3,67 @@ import shutil
 
 import numpy as np
 import rasterio
+from rasterio.enums import Resampling
+from rasterio.io import MemoryFile
 from rasterio.transform import from_bounds
 
-from .logging_utils import log_warning
+from .logging_utils import log_block, log_warning
 
+# Rasters up to this size are encoded in a GDAL in-memory file and written to disk in one go
+MEMORY_FILE_MAX_BYTES = 2 * 1024 ** 3
 
-def save_geotiff(array, output_path, bbox, crs, dtype=np.float32):
+# Internally tiled, LZW-compressed GeoTIFFs: smaller on disk and readable window by window
+GEOTIFF_CREATION_OPTIONS = {
+    "tiled": True,
+    "blockxsize": 512,
+    "blockysize": 512,
+    "compress": "lzw",
+    "bigtiff": "IF_SAFER",
+}
+# Overviews are halved until their longer side would drop below this many pixels
+OVERVIEW_MIN_SIZE = 256
+
+def _overview_factors(height: int, width: int) -> list[int]:
+    """
+    Power-of-two decimation factors for a raster's internal overviews.
+    Args:
+        height (int): Raster height in pixels.
+        width (int): Raster width in pixels.
+    Returns:
+        list[int]: Factors 2, 4, 8, ... down to OVERVIEW_MIN_SIZE; empty for small rasters.
     """
-    Save a NumPy array as a GeoTIFF file.
+    factors = []
+    factor = 2
+    while max(height, width) // factor >= OVERVIEW_MIN_SIZE:
+        factors.append(factor)
+        factor *= 2
+    return factors
+
+def _write_with_overviews(dst, array, overview_factors):
+    """
+    Write all bands and build averaged overviews, so previews read a few reduced levels instead of the full raster.
+    Args:
+        dst (rasterio.io.DatasetWriter): Dataset opened for writing.
+        array (np.ndarray): Band-first array to write.
+        overview_factors (list[int]): Decimation factors from _overview_factors.
+    """
+    dst.write(array)
+    if overview_factors:
+        dst.build_overviews(overview_factors, Resampling.average)
+        dst.update_tags(ns="rio_overview", resampling="average")
+
+def save_geotiff(array, output_path, bbox, crs, dtype=np.float32, num_threads="ALL_CPUS"):
+    """
+    Save a NumPy array as a tiled, LZW-compressed GeoTIFF file with internal overviews.
+    Rasters smaller than MEMORY_FILE_MAX_BYTES are encoded in memory and moved into place
+    atomically; larger rasters are written directly to output_path.
     Args:
         array (np.ndarray): Input array.
         output_path (str): Output file path.
         bbox (list): Bounding box [min_lon, min_lat, max_lon, max_lat].
         crs (rasterio.crs.CRS): Coordinate reference system.
         dtype (str): Data type of the output file.
+        num_threads (int | str): GDAL compression threads; lower it when several rasters are encoded at once.
     """
     if array.ndim == 2:
         height, width = array.shape
@@ -27,19 +74,42 @@ def save_geotiff(array, output_path, bbox, crs, dtype=np.float32):
         array = np.moveaxis(array, -1, 0)
 
     transform = from_bounds(*bbox, width=width, height=height)
+    profile = {
+        "driver": "GTiff",
+        "height": height,
+        "width": width,
+        "count": count,
+        "dtype": dtype,
+        "crs": crs,
+        "transform": transform,
+        **GEOTIFF_CREATION_OPTIONS,
+        "num_threads": str(num_threads),
+        # Floating-point predictor for float rasters, horizontal differencing for integers
+        "predictor": 3 if np.dtype(dtype).kind == "f" else 2,
+    }
+    overview_factors = _overview_factors(height, width)
 
-    with rasterio.open(
-        output_path,
-        'w',
-        driver='GTiff',
-        height=height,
-        width=width,
-        count=count,
-        dtype=dtype,
-        crs=crs,
-        transform=transform
-    ) as dst:
-        dst.write(array)
+    if height * width * count * np.dtype(dtype).itemsize <= MEMORY_FILE_MAX_BYTES:
+        tmp_path = f"{output_path}.tmp"
+        try:
+            with MemoryFile() as memfile:
+                with memfile.open(**profile) as dst:
+                    _write_with_overviews(dst, array, overview_factors)
+                # Streamed in chunks so the encoded file is not copied into a second buffer
+                memfile.seek(0)
+                with open(tmp_path, "wb") as f:
+                    shutil.copyfileobj(memfile, f)
+            os.replace(tmp_path, output_path)
+            return
+        except MemoryError:
+            pass  # Fall back to writing directly to output_path
+        finally:
+            # Never leave a partial .tmp behind for archive_job_outputs to pick up
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    with rasterio.open(output_path, 'w', **profile) as dst:
+        _write_with_overviews(dst, array, overview_factors)
 
 def clean_all_outputs(base_path: str = "."):
     """
@@ -55,11 +125,8 @@ def clean_all_outputs(base_path: str = "."):
     # Remove legacy tiles_* directories
     for folder in glob.glob(os.path.join(base_path, "tiles_*")):
         if os.path.isdir(folder):
-            count = sum(len(files) for _, _, files in os.walk(folder))
             shutil.rmtree(folder)
-            print(f"🧹 Removed legacy directory: {folder} ({count} files)")
             removed_dirs += 1
-            removed_files += count
 
     # Remove job-based structured output directories
     outputs_path = os.path.join(base_path, "outputs")
@@ -67,20 +134,21 @@ def clean_all_outputs(base_path: str = "."):
         for job_dir in os.listdir(outputs_path):
             full_path = os.path.join(outputs_path, job_dir)
             if os.path.isdir(full_path):
-                count = sum(len(files) for _, _, files in os.walk(full_path))
                 shutil.rmtree(full_path)
-                print(f"🧹 Removed job output directory: {full_path} ({count} files)")
                 removed_dirs += 1
-                removed_files += count
 
     # Remove standalone output files (.npy, .tif, .png) in base path
+    counts = {}
     for ext in ("*.npy", "*.tif", "*.png"):
         for f in glob.glob(os.path.join(base_path, ext)):
             os.remove(f)
-            print(f"🧼 Removed file: {f}")
+            counts[ext] = counts.get(ext, 0) + 1
             removed_files += 1
 
-    print(f"\n✅ Cleanup complete — {removed_dirs} directories removed, including {removed_files} total files.")
+    if counts:
+        log_block(header="🧼 Removed files:", lines=[f"{n} {ext}" for ext, n in counts.items()])
+
+    print(f"\n✅ Cleanup complete — {removed_dirs} directories and {removed_files} standalone files removed.")
 
 
 def remove_output_dir(paths: dict):
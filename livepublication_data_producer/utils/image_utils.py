@@ -1,102 +1,240 @@
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import cv2
-import matplotlib.pyplot as plt
 import numpy as np
 import rasterio
-from pyproj import CRS, Transformer
 from rasterio.crs import CRS as RioCRS
-from rasterio.plot import show
-from sentinelhub import BBox
 from shapely.geometry import Polygon
 
+from .crs_utils import get_transformer
 from .file_io import save_geotiff
 from .job_utils import get_stitched_array_path
-from .logging_utils import log_step, log_success, log_warning
-from .plotting import plot_image
+from .logging_utils import (
+    end_inline,
+    in_log_context,
+    log_step,
+    log_success,
+    log_warning,
+)
+from .plotting import plot_image, read_rgb_preview
 
 
+def _tile_header(
+        tile_dir: str,
+        tile_entry: tuple
+    ) -> tuple[tuple[int, ...], np.dtype]:
+    """
+    Return the array shape and dtype of a tile, preferring the values recorded in tile_info.
+    Falls back to reading only the .npy header when the entry has no shape.
+    Args:
+        tile_dir (str): Directory containing the tile files.
+        tile_entry (tuple): (filename, BBox) or (filename, BBox, shape, dtype) tuple.
+    Returns:
+        tuple: (shape, dtype) of the tile array.
+    """
+    if len(tile_entry) > 3 and tile_entry[2] is not None:
+        return tuple(tile_entry[2]), np.dtype(tile_entry[3])
+    with open(os.path.join(tile_dir, tile_entry[0]), "rb") as f:
+        major, _ = np.lib.format.read_magic(f)
+        if major == 1:
+            shape, _, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, _, dtype = np.lib.format.read_array_header_2_0(f)
+    return shape, dtype
+
+def _load_tile(
+        tile_dir: str,
+        filename: str
+    ) -> np.ndarray:
+    """
+    Open a raw tile as a read-only memory map, so pixels are paged in only as they are copied.
+    Args:
+        tile_dir (str): Directory containing the tile files.
+        filename (str): Tile .npy filename.
+    Returns:
+        np.ndarray: Memory-mapped tile array.
+    """
+    return np.load(os.path.join(tile_dir, filename), mmap_mode="r", allow_pickle=False)
+
+def _assemble_row(
+        tile_dir: str,
+        row: list[str],
+        row_height: int
+    ) -> np.ndarray:
+    """
+    Load the tiles of a single row and concatenate them horizontally.
+    Args:
+        tile_dir (str): Directory containing the tile files.
+        row (list): Filenames of the tiles in the row, ordered west to east.
+        row_height (int): Height every tile in the row is resized to.
+    Returns:
+        np.ndarray: Row array with all tiles resized to row_height.
+    """
+    padded_row = []
+    for f in row:
+        tile = _load_tile(tile_dir, f)
+        if tile.shape[0] != row_height:
+            tile = cv2.resize(np.asarray(tile), (tile.shape[1], row_height), interpolation=cv2.INTER_NEAREST)
+        padded_row.append(tile)
+    return np.concatenate(padded_row, axis=1)
+
+def _write_row(
+        tile_dir: str,
+        row: list[str],
+        row_width: int,
+        dest: np.ndarray
+    ) -> None:
+    """
+    Copy the tiles of a single row into its band of the stitched output.
+    Args:
+        tile_dir (str): Directory containing the tile files.
+        row (list): Filenames of the tiles in the row, ordered west to east.
+        row_width (int): Combined width of the tiles in the row.
+        dest (np.ndarray): Output slice (row_height, max_width, ...) to fill.
+    """
+    row_height, max_width = dest.shape[:2]
+    if row_width != max_width:
+        row_array = _assemble_row(tile_dir, row, row_height)
+        # Nearest keeps raw DNs and categorical SCL classes intact, where bilinear would blend them
+        dest[...] = cv2.resize(row_array, (max_width, row_height), interpolation=cv2.INTER_NEAREST)
+        return
+
+    x = 0
+    for f in row:
+        tile = _load_tile(tile_dir, f)
+        if tile.shape[0] != row_height:
+            tile = cv2.resize(np.asarray(tile), (tile.shape[1], row_height), interpolation=cv2.INTER_NEAREST)
+        dest[:, x:x + tile.shape[1]] = tile
+        x += tile.shape[1]
+
+def _tile_bounds_array(
+        tile_coords: list[tuple]
+    ) -> np.ndarray:
+    """
+    Collect tile bounds into one array so layout maths runs as vectorised reductions.
+    Args:
+        tile_coords (list): List of (filename, BBox, ...) tuples.
+    Returns:
+        np.ndarray: (N, 4) float64 array of (min_x, min_y, max_x, max_y) rows.
+    """
+    return np.array([tuple(t[1]) for t in tile_coords], dtype=np.float64).reshape(-1, 4)
+
 def stitch_tiles(
         tile_dir: str, 
-        tile_coords: list[tuple[str, BBox]]
+        tile_coords: list[tuple],
+        output_path: str | None = None
     ) -> np.ndarray:
     """
     Stitch tiles together based on their bounding boxes.
+    The mosaic layout is computed from the tile shapes recorded in tile_coords, so tile
+    files are only opened while copying pixel data. Rows are written straight into a
+    preallocated output, which is a memory-mapped .npy file when output_path is given.
     Args:
         tile_dir (str): Directory containing the tile files.
-        tile_coords (list): List of tuples containing filenames and bounding boxes.
+        tile_coords (list): List of (filename, BBox) or (filename, BBox, shape, dtype) tuples.
+        output_path (str, optional): .npy path to stream the stitched array into.
     Returns:
         np.ndarray: Stitched image array.
     """
-    sorted_tiles = sorted(tile_coords, key=lambda t: (-t[1].min_y, t[1].min_x))
-    rows = []
-    current_row = []
-    current_lat = None
     epsilon = 1e-4
 
-    for fname, bbox in sorted_tiles:
-        lat = bbox.min_y
-        if current_lat is None or abs(lat - current_lat) < epsilon:
-            current_row.append(fname)
-            current_lat = lat
-        else:
-            rows.append(current_row)
-            current_row = [fname]
-            current_lat = lat
-    if current_row:
-        rows.append(current_row)
-
-    final_rows = []
-    for row in rows:
-        tile_row = [np.load(os.path.join(tile_dir, f)) for f in row]
-        max_height = max(t.shape[0] for t in tile_row)
-        padded_row = []
-        for tile in tile_row:
-            if tile.shape[0] != max_height:
-                resized = cv2.resize(tile, (tile.shape[1], max_height), interpolation=cv2.INTER_LINEAR)
-            else:
-                resized = tile
-            padded_row.append(resized)
-        final_rows.append(np.concatenate(padded_row, axis=1))
-    max_width = max(row.shape[1] for row in final_rows)
-    for i in range(len(final_rows)):
-        if final_rows[i].shape[1] != max_width:
-            final_rows[i] = cv2.resize(final_rows[i], (max_width, final_rows[i].shape[0]), interpolation=cv2.INTER_LINEAR)
-    full_image = np.concatenate(final_rows, axis=0)
+    # Sort north-to-south then west-to-east, and start a new row wherever the
+    # latitude jumps by more than epsilon between consecutive tiles.
+    bounds = _tile_bounds_array(tile_coords)
+    min_x, min_y = bounds[:, 0], bounds[:, 1]
+    order = np.lexsort((min_x, -min_y))
+    row_breaks = np.flatnonzero(np.abs(np.diff(min_y[order])) >= epsilon) + 1
+    rows = [[tile_coords[i] for i in row] for row in np.split(order, row_breaks)]
+
+    # Layout pass: row heights and widths from tile headers, without loading pixels
+    row_headers = [[_tile_header(tile_dir, t) for t in row] for row in rows]
+    row_heights = [max(shape[0] for shape, _ in headers) for headers in row_headers]
+    row_widths = [sum(shape[1] for shape, _ in headers) for headers in row_headers]
+    max_width = max(row_widths)
+    first_shape = row_headers[0][0][0]
+    dtype = np.result_type(*[dtype for headers in row_headers for _, dtype in headers])
+    out_shape = (sum(row_heights), max_width) + tuple(first_shape[2:])
+
+    if output_path is not None:
+        full_image = np.lib.format.open_memmap(output_path, mode="w+", dtype=dtype, shape=out_shape)
+    else:
+        full_image = np.empty(out_shape, dtype=dtype)
+
+    # Each row owns a disjoint band of the output, so workers copy without locking
+    row_offsets = np.cumsum([0] + row_heights[:-1])
+    row_files = [[t[0] for t in row] for row in rows]
+    with ThreadPoolExecutor(max_workers=min(8, len(rows))) as executor:
+        list(executor.map(
+            lambda i: _write_row(
+                tile_dir,
+                row_files[i],
+                row_widths[i],
+                full_image[row_offsets[i]:row_offsets[i] + row_heights[i]],
+            ),
+            range(len(rows)),
+        ))
+
+    if output_path is not None:
+        full_image.flush()
     return full_image
 
 def compute_stitched_bbox(
-        tile_info: list[tuple[str, BBox]]
+        tile_info: list[tuple]
     ) -> tuple[float, float, float, float]:
     """
     Compute the bounding box from a list of tile bounding boxes.
     Args:
-        tile_info (list): List of (filename, BBox) tuples.
+        tile_info (list): List of (filename, BBox, ...) tuples.
     Returns:
         tuple: (min_lon, min_lat, max_lon, max_lat)
     """
-    all_bboxes = [bbox for _, bbox in tile_info]
-    min_lon = min(b.min_x for b in all_bboxes)
-    min_lat = min(b.min_y for b in all_bboxes)
-    max_lon = max(b.max_x for b in all_bboxes)
-    max_lat = max(b.max_y for b in all_bboxes)
+    bounds = _tile_bounds_array(tile_info)
+    min_lon, min_lat = bounds[:, :2].min(axis=0).tolist()
+    max_lon, max_lat = bounds[:, 2:].max(axis=0).tolist()
     return (min_lon, min_lat, max_lon, max_lat)
 
+# Rows processed per block by the per-pixel band kernels; keeps temporaries strip-sized
+# instead of full-mosaic-sized for large rasters.
+BLOCK_ROWS = 1024
+
+# Integer tiles hold Sentinel-2 L2A digital numbers, i.e. reflectance scaled by this factor
+REFLECTANCE_SCALE = 10000
+
+# Lookup table over SCL values: cloud shadows, medium/high clouds and cirrus are masked.
+# Indexing it is a single gather per pixel, where np.isin sorts and searches.
+CLOUDY_SCL_CLASSES = np.zeros(256, dtype=bool)
+CLOUDY_SCL_CLASSES[[3, 8, 9, 10]] = True
+
 def compute_ndvi(
-        stitched_array
+        stitched_array,
+        out: np.ndarray | None = None
     ) -> np.ndarray:
     """
     Compute NDVI from the stitched array.
     Args:
-        stitched_array (np.ndarray): Stitched image array.
+        stitched_array (np.ndarray): Stitched image array of reflectances or digital numbers;
+            NDVI is a band ratio, so the scale does not matter.
+        out (np.ndarray, optional): Preallocated float32 (H, W) array to write NDVI into.
     Returns:
-        np.ndarray: NDVI array.
+        np.ndarray: NDVI array (float32).
     """
-    red = stitched_array[..., 2]
-    nir = stitched_array[..., 3]
-    ndvi = (nir - red) / (nir + red + 1e-6)
-    return np.clip(ndvi, -1, 1)
+    if out is None:
+        out = np.empty(stitched_array.shape[:-1], dtype=np.float32)
+
+    # In-place float32 ufuncs over row blocks: one strip-sized temporary, no float64 copies
+    for start in range(0, stitched_array.shape[0], BLOCK_ROWS):
+        block = stitched_array[start:start + BLOCK_ROWS]
+        red = block[..., 2]
+        nir = block[..., 3]
+        block_out = out[start:start + BLOCK_ROWS]
+        denom = np.add(nir, red, dtype=np.float32)
+        denom += 1e-6
+        np.subtract(nir, red, out=block_out, dtype=np.float32)
+        np.divide(block_out, denom, out=block_out)
+        np.clip(block_out, -1, 1, out=block_out)
+    return out
 
 def rasterize_true_color(
         stitched_array
@@ -104,27 +242,38 @@ def rasterize_true_color(
     """
     Rasterize true color from the stitched array.
     Args:
-        stitched_array (np.ndarray): Stitched image array.
+        stitched_array (np.ndarray): Stitched image array of reflectances, or of digital numbers
+            (reflectance * REFLECTANCE_SCALE) when it has an integer dtype.
     Returns:
-        np.ndarray: RGB array.
+        np.ndarray: RGB array (float32).
     """
-    red = stitched_array[..., 2]
-    green = stitched_array[..., 1]
-    blue = stitched_array[..., 0]
-    rgb = np.stack([red, green, blue], axis=-1)
-    return np.clip(rgb * 3.5, 0, 1)
+    gain = 3.5
+    if np.issubdtype(stitched_array.dtype, np.integer):
+        gain /= REFLECTANCE_SCALE
+
+    rgb = np.empty(stitched_array.shape[:-1] + (3,), dtype=np.float32)
+    for start in range(0, stitched_array.shape[0], BLOCK_ROWS):
+        block = stitched_array[start:start + BLOCK_ROWS]
+        block_out = rgb[start:start + BLOCK_ROWS]
+        # Bands are stored B02, B03, B04 (blue, green, red); write them out as red, green, blue
+        for channel, band in enumerate((2, 1, 0)):
+            np.multiply(block[..., band], gain, out=block_out[..., channel], dtype=np.float32)
+        np.clip(block_out, 0, 1, out=block_out)
+    return rgb
 
 def stitch_raw_tile_data(
         paths: dict,
-        tile_info: list[tuple[str, BBox]], 
+        tile_info: list[tuple],
     ) -> np.ndarray:
     """
-    Stitch raw tile arrays into a single image and save to disk.
+    Stitch raw tile arrays into a single image, streaming it to disk as a memory-mapped .npy.
     Args:
-        tile_info (list): List of (filename, BBox) tuples.
-        paths (dict, optional): Output directory structure used to determine default path if `output_path` is not provided.
+        paths (dict): Output directory structure; tiles are read from `paths["raw_tiles"]` and
+            the stitched array is written to `get_stitched_array_path(paths)`.
+        tile_info (list): List of (filename, BBox, shape, dtype) tuples; shape and dtype are
+            None for raw tiles reused from the cache.
     Returns:
-        np.ndarray: The stitched image array.
+        np.ndarray: The stitched image array (memory-mapped from the saved .npy).
     """
     try:
         if not tile_info:
@@ -134,10 +283,9 @@ def stitch_raw_tile_data(
             raise ValueError("Paths dictionary is required to save the stitched image.")
         output_path = get_stitched_array_path(paths)
 
-        print() # for newline after inline logging
+        end_inline()  # for newline after inline logging
         log_step("🧵 Stitching tiles...")
-        stitched_array = stitch_tiles(paths["raw_tiles"], tile_info)
-        np.save(output_path, stitched_array)
+        stitched_array = stitch_tiles(paths["raw_tiles"], tile_info, output_path=output_path)
         log_success(f"Stitched tiles saved to {output_path}")
         return stitched_array
 
@@ -147,15 +295,20 @@ def stitch_raw_tile_data(
 
 def generate_ndvi_products(
         paths: dict,
-        tile_info: list[tuple[str, BBox]],
-        stitched_image: np.ndarray
+        tile_info: list[tuple],
+        stitched_image: np.ndarray,
+        bbox: tuple[float, float, float, float] | None = None,
+        encode_threads: int | str = "ALL_CPUS"
     ) -> None:
     """
     Compute and save NDVI imagery as PNG and GeoTIFF.
     Args:
         paths (dict): Dictionary of output directory paths.
-        tile_info (list): List of (filename, BBox) tuples.
+        tile_info (list): List of (filename, BBox, shape, dtype) tuples; shape and dtype are
+            None for raw tiles reused from the cache.
         stitched_image (np.ndarray): Stitched satellite image.
+        bbox (tuple, optional): Precomputed compute_stitched_bbox(tile_info).
+        encode_threads (int | str): GDAL compression threads for the GeoTIFF.
     """
     if stitched_image is None or tile_info is None or len(tile_info) == 0:
         log_warning("⚠️ Skipping NDVI generation: no stitched image or tile info provided.")
@@ -163,9 +316,10 @@ def generate_ndvi_products(
     log_step("🧪 Generating NDVI imagery...")
     ndvi = compute_ndvi(stitched_image)
 
-    scl = stitched_image[..., -1].astype(np.uint8)
-    cloud_mask = np.isin(scl, [3, 8, 9, 10])  # cloud shadows, medium/high clouds, cirrus
-    ndvi_masked = np.where(cloud_mask, np.nan, ndvi)
+    cloud_mask = CLOUDY_SCL_CLASSES[stitched_image[..., -1].astype(np.uint8)]
+    # Mask in place: ndvi is a fresh float32 array, so no second full-size copy is needed
+    ndvi[cloud_mask] = np.nan
+    ndvi_masked = ndvi
 
     mask_preview_path = os.path.join(paths["imagery"], "ndvi_cloud_mask.png")
     plot_image(image=cloud_mask.astype(np.uint8), cmap="gray", save_path=mask_preview_path)
@@ -174,22 +328,28 @@ def generate_ndvi_products(
     plot_image(image=ndvi_masked, cmap="RdYlGn", save_path=ndvi_png_path)
 
     ndvi_tif_path = os.path.join(paths["imagery"], "ndvi.tif")
-    bbox = compute_stitched_bbox(tile_info)
-    save_geotiff(ndvi_masked, ndvi_tif_path, bbox, RioCRS.from_epsg(4326))
+    if bbox is None:
+        bbox = compute_stitched_bbox(tile_info)
+    save_geotiff(ndvi_masked, ndvi_tif_path, bbox, RioCRS.from_epsg(4326), num_threads=encode_threads)
 
     log_success("NDVI imagery saved.")
 
 def generate_true_color_products(
         paths: dict,
-        tile_info: list[tuple[str, BBox]], 
-        stitched_image: np.ndarray
+        tile_info: list[tuple],
+        stitched_image: np.ndarray,
+        bbox: tuple[float, float, float, float] | None = None,
+        encode_threads: int | str = "ALL_CPUS"
     ) -> None:
     """
     Compute and save true-color composite imagery as PNG and GeoTIFF.
     Args:
         paths (dict): Dictionary of output directory paths.
-        tile_info (list): List of (filename, BBox) tuples.
+        tile_info (list): List of (filename, BBox, shape, dtype) tuples; shape and dtype are
+            None for raw tiles reused from the cache.
         stitched_image (np.ndarray): Stitched satellite image.
+        bbox (tuple, optional): Precomputed compute_stitched_bbox(tile_info).
+        encode_threads (int | str): GDAL compression threads for the GeoTIFF.
     """
     if stitched_image is None or tile_info is None or len(tile_info) == 0:
         log_warning("⚠️ Skipping true-color generation: no stitched image or tile info provided.")
@@ -201,15 +361,51 @@ def generate_true_color_products(
     plot_image(rgb, save_path=rgb_png_path)
 
     rgb_tif_path = os.path.join(paths["imagery"], "true_color.tif")
-    bbox = compute_stitched_bbox(tile_info)
-    save_geotiff(rgb, rgb_tif_path, bbox, RioCRS.from_epsg(4326))
+    if bbox is None:
+        bbox = compute_stitched_bbox(tile_info)
+    save_geotiff(rgb, rgb_tif_path, bbox, RioCRS.from_epsg(4326), num_threads=encode_threads)
 
     log_success("True-color imagery saved.")
 
+def generate_imagery_products(
+        paths: dict,
+        tile_info: list[tuple],
+        stitched_image: np.ndarray,
+        encode_threads: int | str = "ALL_CPUS"
+    ) -> None:
+    """
+    Generate the NDVI and true-color products concurrently.
+    Both only read the stitched image and write their own files, and the PNG and GeoTIFF
+    encoders release the GIL, so the two overlap. Their PNGs go through plt.imsave, which
+    does not touch pyplot's figure state.
+    Args:
+        paths (dict): Dictionary of output directory paths.
+        tile_info (list): List of (filename, BBox, shape, dtype) tuples; shape and dtype are
+            None for raw tiles reused from the cache.
+        stitched_image (np.ndarray): Stitched satellite image.
+        encode_threads (int | str): GDAL compression threads for each of the two GeoTIFFs.
+    """
+    bbox = compute_stitched_bbox(tile_info) if tile_info else None
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(
+                in_log_context(generate),
+                paths=paths,
+                tile_info=tile_info,
+                stitched_image=stitched_image,
+                bbox=bbox,
+                encode_threads=encode_threads,
+            )
+            for generate in (generate_ndvi_products, generate_true_color_products)
+        ]
+        for future in futures:
+            future.result()
+
 def validate_image_coverage_with_tile_footprints(
     stitched_image_path: str,
     selected_orbit_path: str,
-    output_path: str | None = None
+    output_path: str | None = None,
+    verbose: bool = False
 ) -> None:
     """
     Validates stitched image coverage against the contributing tile dataEnvelopes.
@@ -218,31 +414,39 @@ def validate_image_coverage_with_tile_footprints(
         stitched_image_path (str): Path to the stitched GeoTIFF image (e.g. true_color.tif).
         selected_orbit_path (str): Path to the *_selected_orbit.json file containing dataEnvelope info.
         output_path (str | None): Optional path to save the output PNG. If None, the figure will be shown.
+        verbose (bool): Print each tile's CRS and raw/transformed coordinates for debugging.
     """
+    import matplotlib.pyplot as plt
+    from rasterio.plot import show
+
     with rasterio.open(stitched_image_path) as src:
-        image = src.read([1, 2, 3])  # RGB bands
+        image, image_transform = read_rgb_preview(src)  # RGB bands
         image_crs = src.crs
         fig, ax = plt.subplots(figsize=(10, 10))
-        show(image, transform=src.transform, ax=ax)
+        show(image, transform=image_transform, ax=ax)
 
         with open(selected_orbit_path, "r") as f:
             orbit_data = json.load(f)
 
+        image_crs_wkt = image_crs.to_wkt()
         for i, tile in enumerate(orbit_data.get("orbit", {}).get("tiles", [])):
             coords = tile["dataEnvelope"]["coordinates"][0]
             tile_crs_str = tile["dataEnvelope"]["crs"]["properties"]["name"]
-            tile_crs = CRS.from_user_input(tile_crs_str)
 
-            print("Tile CRS:", tile_crs)
-            print("Image CRS:", image_crs)
-            transformer = Transformer.from_crs(tile_crs, image_crs, always_xy=True)
-            transformed_coords = [transformer.transform(x, y) for x, y in coords]
+            if verbose:
+                print("Tile CRS:", tile_crs_str)
+                print("Image CRS:", image_crs)
+            # Tiles of one orbit share a few CRSs, so transformers are reused across tiles
+            transformer = get_transformer(tile_crs_str, image_crs_wkt)
+            xs, ys = np.asarray(coords, dtype=np.float64).T
+            transformed_coords = np.column_stack(transformer.transform(xs, ys))
             poly = Polygon(transformed_coords)
             x, y = poly.exterior.xy
             ax.plot(x, y, color='red', linewidth=2, label='Tile' if i == 0 else "")
 
-            print("Raw tile coords:", coords)
-            print("Transformed coords:", transformed_coords)
+            if verbose:
+                print("Raw tile coords:", coords)
+                print("Transformed coords:", transformed_coords)
 
         ax.set_title("Stitched Image with Tile Footprints")
         ax.legend()
@@ -142,6 +142,21 @@ def get_tile_prefix(
     region = config.region.lower().replace(" ", "_")
     return f"{region}_tile{idx}"
 
+def get_tile_prefixes(
+        config: "DataAcquisitionConfig",
+        count: int
+    ) -> list[str]:
+    """
+    Generate the tile prefixes for tiles 0..count-1, normalising the region name only once.
+    Args:
+        config (DataAcquisitionConfig): The data acquisition config with region info.
+        count (int): Number of tiles.
+    Returns:
+        list: Prefixes matching get_tile_prefix(config, idx) for each index.
+    """
+    region = config.region.lower().replace(" ", "_")
+    return [f"{region}_tile{idx}" for idx in range(count)]
+
 def get_orbit_metadata_path(
         paths: dict, 
         tile_prefix: str
@@ -156,6 +171,20 @@ def get_orbit_metadata_path(
     """
     return os.path.join(paths["metadata"], f"{tile_prefix}_orbit_metadata.json")
 
+def get_metadata_cache_path(
+        paths: dict,
+        cache_key: str
+    ) -> str:
+    """
+    Construct the full file path for a cached orbit metadata response.
+    Args:
+        paths (dict): Dictionary of output paths from prepare_job_output_dirs.
+        cache_key (str): Content-addressed key of the metadata request.
+    Returns:
+        str: Full file path to the cached metadata JSON.
+    """
+    return os.path.join(paths["metadata"], ".cache", f"{cache_key}.json")
+
 def get_stitched_array_path(
         paths: dict
     ) -> str:
@@ -166,4 +195,34 @@ def get_stitched_array_path(
     Returns:
         str: Full file path to the stitched .npy array.
     """
-    return os.path.join(paths["stitched"], "stitched_raw_bands.npy")
\ No newline at end of file
+    return os.path.join(paths["stitched"], "stitched_raw_bands.npy")
+
+def is_job_complete(
+        paths: dict
+    ) -> bool:
+    """
+    Check whether a previous run finished this job and its products are still on disk.
+    Args:
+        paths (dict): Dictionary of output paths from get_job_output_paths.
+    Returns:
+        bool: True if the completion marker and non-empty product GeoTIFFs exist.
+    """
+    if not os.path.exists(os.path.join(paths["base"], ".done")):
+        return False
+    for product in ("ndvi.tif", "true_color.tif"):
+        try:
+            if os.stat(os.path.join(paths["imagery"], product)).st_size == 0:
+                return False
+        except FileNotFoundError:
+            return False
+    return True
+
+def mark_job_complete(
+        paths: dict
+    ) -> None:
+    """
+    Write the completion marker checked by is_job_complete.
+    Args:
+        paths (dict): Dictionary of output paths from prepare_job_output_dirs.
+    """
+    open(os.path.join(paths["base"], ".done"), "w").close()
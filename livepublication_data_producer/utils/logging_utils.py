@@ -1,23 +1,115 @@
 # logging_utils.py - pragma: no cover
 
+import contextvars
 import sys
+import threading
+import time
+from contextlib import contextmanager
 
+# Serialises console writes from concurrent jobs so their lines do not interleave
+_console_lock = threading.Lock()
+# Prefix naming the job a thread is working on; threads start without one
+_log_prefix = contextvars.ContextVar("log_prefix", default="")
+# Carriage-return progress lines overwrite each other when several jobs log at once
+_inline_enabled = True
+
+@contextmanager
+def log_context(prefix: str):
+    """
+    Prefix every message logged by the current thread with the given label, e.g. a job id.
+
+    Args:
+        prefix (str): Label shown in brackets before each message.
+    """
+    token = _log_prefix.set(f"[{prefix}] ")
+    try:
+        yield
+    finally:
+        _log_prefix.reset(token)
+
+def in_log_context(fn):
+    """
+    Wrap fn so it logs with the caller's prefix, e.g. when it runs on a worker pool thread.
+
+    Args:
+        fn (callable): Function to run under the current log prefix.
+    Returns:
+        callable: Wrapper with the same signature as fn.
+    """
+    prefix = _log_prefix.get()
+
+    def run(*args, **kwargs):
+        token = _log_prefix.set(prefix)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _log_prefix.reset(token)
+
+    return run
+
+def set_inline_logging(enabled: bool):
+    """
+    Enable or disable inline progress lines, e.g. while several jobs share the console.
+
+    Args:
+        enabled (bool): Whether log_inline and end_inline write to the console.
+    """
+    global _inline_enabled
+    _inline_enabled = enabled
 
 def log_step(message: str):
-    print(f"🔹 {message}")
+    with _console_lock:
+        print(f"🔹 {_log_prefix.get()}{message}")
 
 def log_success(message: str):
-    print(f"✅ {message}")
+    with _console_lock:
+        print(f"✅ {_log_prefix.get()}{message}")
 
 def log_warning(message: str):
-    print(f"⚠️  {message}")
+    with _console_lock:
+        print(f"⚠️  {_log_prefix.get()}{message}")
 
 def log_error(message: str):
-    print(f"❌ {message}", file=sys.stderr)
+    with _console_lock:
+        print(f"❌ {_log_prefix.get()}{message}", file=sys.stderr)
 
 def log_inline(message: str):
-    print(f"\r{message}", end="")
-    sys.stdout.flush()
+    if not _inline_enabled:
+        return
+    with _console_lock:
+        print(f"\r{_log_prefix.get()}{message}", end="")
+        sys.stdout.flush()
+
+def end_inline():
+    """
+    Finish the current inline progress line so the next message starts on a fresh line.
+    """
+    if not _inline_enabled:
+        return
+    with _console_lock:
+        print()
+
+def inline_progress(template: str, total: int, min_interval: float = 0.1):
+    """
+    Build a throttled inline progress logger for fast loops.
+
+    Args:
+        template (str): Message template with {done} and {total} placeholders.
+        total (int): Number of items in the loop.
+        min_interval (float): Minimum seconds between updates; the final count is always logged.
+    Returns:
+        callable: update(done, force=False) that logs the progress message when due.
+    """
+    last_logged = float("-inf")
+
+    def update(done: int, force: bool = False):
+        nonlocal last_logged
+        now = time.monotonic()
+        if force or done >= total or now - last_logged >= min_interval:
+            log_inline(template.format(done=done, total=total))
+            last_logged = now
+
+    return update
 
 def log_block(header: str, lines: list[str]):
     """
@@ -27,6 +119,7 @@ def log_block(header: str, lines: list[str]):
         header (str): The header message for the block.
         lines (list of str): Lines to print beneath the header.
     """
-    print(header)
-    for line in lines:
-        print(line)
+    with _console_lock:
+        print(header)
+        for line in lines:
+            print(line)
@@ -1,35 +1,83 @@
-import glob
+import hashlib
 import json
 import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 
-from pyproj import CRS as pyprojCRS
-from pyproj import Transformer
+import numpy as np
+import shapely
 from sentinelhub import (
     CRS,
     BBox,
     DataCollection,
-    MimeType,
-    SentinelHubCatalog,
-    SentinelHubRequest,
     SHConfig,
-    bbox_to_dimensions,
 )
-from shapely.geometry import box, shape
-from shapely.ops import transform, unary_union
-
-from .job_utils import get_orbit_metadata_path, get_tile_prefix
-from .logging_utils import log_inline, log_step, log_success, log_warning
-
+from sentinelhub.exceptions import DownloadFailedException
+from shapely import STRtree
+from shapely.geometry import box, mapping, shape
+from shapely.ops import unary_union
+
+from .crs_utils import get_transformer
+from .job_utils import (
+    get_metadata_cache_path,
+    get_orbit_metadata_path,
+    get_tile_prefixes,
+)
+from .logging_utils import (
+    end_inline,
+    in_log_context,
+    inline_progress,
+    log_step,
+    log_success,
+    log_warning,
+)
+from .session_utils import get_pooled_catalog
+
+# Catalog fields needed to rebuild per-tile orbit metadata from a single search
+CATALOG_SEARCH_FIELDS = {
+    "include": ["id", "geometry", "properties.datetime", "properties.eo:cloud_cover"],
+    "exclude": [],
+}
+WGS84_GEOJSON_CRS = {"type": "name", "properties": {"name": "EPSG:4326"}}
+# Sentinel-2 product names: mission, datatake sensing start, relative orbit and MGRS tile,
+# e.g. S2A_MSIL2A_20220101T235251_N0301_R130_T55HFA_20220102T014255
+S2_PRODUCT_ID_PATTERN = re.compile(
+    r"^(?P<mission>S2[A-D])_MSIL2A_(?P<datatake>\d{8}T\d{6})_N\d{4}_R(?P<orbit>\d{3})_T(?P<tile>\w{5})_"
+)
+# Concurrent product catalog lookups, bounded like tile downloads to respect rate limits
+MAX_METADATA_WORKERS = 8
+# Product ids looked up per catalog search request
+PRODUCT_SEARCH_BATCH_SIZE = 50
+# LP_NO_CACHE=1 ignores cached responses for this run; fresh results still refresh the cache
+METADATA_CACHE_DISABLED = os.getenv("LP_NO_CACHE") == "1"
+
+
+def _reproject_geometry(
+        geom,
+        source_crs: str,
+        target_crs: str
+    ):
+    """
+    Reproject a shapely geometry with one vectorised transformer call over all its vertices.
+    Args:
+        geom: Shapely geometry in source_crs; holes and multi-part geometries are kept.
+        source_crs (str): CRS of the input geometry.
+        target_crs (str): CRS to reproject to.
+    Returns:
+        Shapely geometry in target_crs.
+    """
+    transformer = get_transformer(source_crs, target_crs)
+    return shapely.transform(geom, lambda xy: np.column_stack(transformer.transform(xy[:, 0], xy[:, 1])))
 
-def compute_orbit_bbox(orbit: dict) -> box:
+def _orbit_tile_geometries(orbit: dict) -> list:
     """
-    Computes the bounding box that covers all tiles in an orbit.
+    Collect the tile footprints of an orbit in WGS84.
     Args:
         orbit (dict): Orbit dictionary with tile geometries.
-        debug_path (str, optional): Path to write debug JSON file.
     Returns:
-        tuple: Bounding box (minx, miny, maxx, maxy) covering all tile geometries.
+        list: Shapely geometries of the orbit's tiles.
     """
     orbit_geometries = []
 
@@ -39,75 +87,175 @@ def compute_orbit_bbox(orbit: dict) -> box:
             continue
 
         geom = shape(geometry_data)
-        source_crs = pyprojCRS.from_user_input(geometry_data["crs"]["properties"]["name"])
-        target_crs = pyprojCRS.from_epsg(4326)
-        transformer = Transformer.from_crs(source_crs, target_crs, always_xy=True)
-        geom_wgs84 = transform(transformer.transform, geom)
-        orbit_geometries.append(geom_wgs84)
+        source_crs = geometry_data["crs"]["properties"]["name"]
+        if source_crs != "EPSG:4326":  # Catalog footprints are already WGS84
+            geom = _reproject_geometry(geom, source_crs, "EPSG:4326")
+        orbit_geometries.append(geom)
 
     if not orbit_geometries:
         raise ValueError("No valid geometries found in orbit.")
 
-    return unary_union(orbit_geometries)
+    return orbit_geometries
 
-def discover_orbit_metadata(
-    paths: dict,
-    tile: BBox,
-    time_interval: tuple[date, date],
-    config: SHConfig,
-    evalscript: str,
-    prefix: str, 
-) -> dict:
+def compute_orbit_bbox(orbit: dict) -> box:
     """
-    Discover orbit metadata for a given tile and time interval using Mosaicking.ORBIT mode.
+    Computes the bounding box that covers all tiles in an orbit.
     Args:
-        paths (dict): Output directory structure dictionary.
-        tile (BBox): Tile bounding box to query.
+        orbit (dict): Orbit dictionary with tile geometries.
+    Returns:
+        tuple: Bounding box (minx, miny, maxx, maxy) covering all tile geometries.
+    """
+    return unary_union(_orbit_tile_geometries(orbit))
+
+def _write_json_atomic(
+        path: str,
+        data: dict,
+        indent: int | None = 4
+    ) -> None:
+    """
+    Write JSON to a temporary sibling file and move it into place, so readers never see a partial file.
+    Args:
+        path (str): Destination file path.
+        data (dict): JSON-serialisable data.
+        indent (int, optional): Indentation level. None writes compact JSON through the C encoder,
+            roughly 10x faster than indented output; use it for files only the pipeline reads.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(json.dumps(data, indent=indent))
+    os.replace(tmp_path, path)
+
+def _metadata_cache_key(
+        tile: BBox,
+        time_interval: tuple[date, date],
+        query: str
+    ) -> str:
+    """
+    Content-addressed key identifying a Catalog search request.
+    Args:
+        tile (BBox): Bounding box being queried.
         time_interval (tuple): Tuple of (start_date, end_date).
-        config: SentinelHub config object.
-        evalscript (str): Evalscript to use for metadata request.
-        prefix (str): Prefix for the metadata file.
+        query (str): Serialised search fields used for the request.
     Returns:
-        dict: Parsed orbit metadata.
-    """
-    size = bbox_to_dimensions(tile, resolution=10)
-
-    request = SentinelHubRequest(
-        evalscript=evalscript,
-        input_data=[
-            SentinelHubRequest.input_data(
-                data_collection=DataCollection.SENTINEL2_L2A.define_from(
-                    name="s2l2a", service_url="https://sh.dataspace.copernicus.eu"
-                ),
-                time_interval=time_interval,
-            )
-        ],
-        responses=[
-            SentinelHubRequest.output_response("userdata", MimeType.JSON)
-        ],
-        bbox=tile,
-        size=size,
-        config=config
-    )
+        str: Hex digest of the request parameters.
+    """
+    request_repr = repr((tuple(tile), str(tile.crs), tuple(time_interval), query))
+    return hashlib.blake2b(request_repr.encode(), digest_size=16).hexdigest()
 
+def _load_cached_metadata(
+        cache_path: str,
+        cache_ttl: float
+    ) -> dict | None:
+    """
+    Load a cached Catalog search result if it exists and is younger than cache_ttl seconds.
+    Args:
+        cache_path (str): Path to the cached search result file.
+        cache_ttl (float): Maximum cache age in seconds.
+    Returns:
+        dict | None: Cached metadata, or None when missing, stale or disabled via LP_NO_CACHE.
+    """
+    if METADATA_CACHE_DISABLED:
+        return None
     try:
-        response = request.get_data()[0]
-        if isinstance(response, dict) and "userdata.json" in response:
-            metadata = response["userdata.json"]
-            metadata["tile_bbox"] = list(tile)  # Inject tile_bbox into metadata
-        else:
-            metadata = response  # Fallback if JSON is returned directly
-    except Exception as e:
-        log_warning(f"Failed to retrieve orbit metadata: {e}")
-        raise
+        age = time.time() - os.path.getmtime(cache_path)
+    except FileNotFoundError:
+        return None
+    if age >= cache_ttl:
+        return None
+    with open(cache_path, 'r') as f:
+        return json.load(f)
+
+def _avg_cloud_per_orbit(orbits: list[dict]) -> np.ndarray:
+    """
+    Mean cloud coverage of each orbit, computed over a packed array of all tile coverages.
+    Orbits without tiles count as fully clouded.
+    Args:
+        orbits (list): Orbit dictionaries with per-tile cloudCoverage.
+    Returns:
+        np.ndarray: Average cloud coverage in percent, one value per orbit.
+    """
+    tile_counts = np.array([len(orbit.get("tiles", ())) for orbit in orbits])
+    clouds = np.fromiter(
+        (tile.get("cloudCoverage", 100.0) for orbit in orbits for tile in orbit.get("tiles", ())),
+        dtype=np.float64,
+        count=int(tile_counts.sum()),
+    )
+    orbit_index = np.repeat(np.arange(len(orbits)), tile_counts)
+    totals = np.bincount(orbit_index, weights=clouds, minlength=len(orbits))
+    return np.divide(totals, tile_counts, out=np.full(len(orbits), 100.0), where=tile_counts > 0)
 
-    os.makedirs(paths["metadata"], exist_ok=True)
-    metadata_path = os.path.join(paths["metadata"], f"{prefix}_orbit_metadata.json")
-    
-    with open(metadata_path, 'w') as f:
-        json.dump(metadata, f, indent=4)
+def _filter_orbits_by_coverage(
+        metadata: dict,
+        tile_bbox: list
+    ) -> list[dict]:
+    """
+    Filter orbits based on spatial coverage over the tile.
+    Args:
+        metadata (dict): Orbit metadata dictionary.
+        tile_bbox (list): Tile bounding box coordinates.
+    Returns:
+        list: Filtered orbits with sufficient spatial coverage.
+    """
+    tile_box = box(*tile_bbox)
+    tile_area = tile_box.area
+    tile_min_x, tile_min_y, tile_max_x, tile_max_y = tile_bbox
+    candidates = []
+    footprints = []
+    for orbit in metadata["orbits"]:
+        geometries = _orbit_tile_geometries(orbit)
+
+        # The footprints' joint envelope bounds the coverage from above, so orbits whose
+        # envelope already misses more than 10% of the tile skip the polygon union
+        envelopes = shapely.bounds(geometries)
+        overlap_w = min(envelopes[:, 2].max(), tile_max_x) - max(envelopes[:, 0].min(), tile_min_x)
+        overlap_h = min(envelopes[:, 3].max(), tile_max_y) - max(envelopes[:, 1].min(), tile_min_y)
+        if max(overlap_w, 0) * max(overlap_h, 0) / tile_area <= 0.9:
+            continue
+
+        candidates.append(orbit)
+        footprints.append(unary_union(geometries))
+
+    # Exact coverage of all remaining orbits in one vectorised intersection
+    percentage_coverage = shapely.area(shapely.intersection(footprints, tile_box)) / tile_area
+    # Check if the orbit covers more than 90% of the tile
+    filtered_orbits = [orbit for orbit, coverage in zip(candidates, percentage_coverage) if coverage > 0.9]
+
+    if not filtered_orbits:
+        raise ValueError("No valid orbits with sufficient spatial coverage.")
+    return filtered_orbits
+
+def _select_least_cloud(
+        metadata: dict,
+        tile_bbox: list
+    ) -> dict:
+    """
+    Select the orbit with the lowest average cloud coverage among those covering the tile.
+    Args:
+        metadata (dict): Orbit metadata dictionary.
+        tile_bbox (list): Tile bounding box coordinates.
+    Returns:
+        dict: Selected orbit dictionary.
+    """
+    valid_orbits = _filter_orbits_by_coverage(metadata, tile_bbox)
+    avg_clouds = _avg_cloud_per_orbit(valid_orbits)
+    best_idx = int(np.argmin(avg_clouds))
+    best_cloud, best_orbit = float(avg_clouds[best_idx]), valid_orbits[best_idx]
+
+    return {
+        "strategy": "least_cloud",
+        "orbit_date": best_orbit["dateFrom"][:10],
+        "product_ids": [tile["productId"] for tile in best_orbit["tiles"]],
+        "tile_ids": [tile["tileId"] for tile in best_orbit["tiles"]],
+        "cloud_coverage": round(best_cloud, 2),
+        "orbit": best_orbit
+    }
+
+# Orbit selection strategies by name; see profiles.py for the planned ones
+ORBIT_SELECTION_STRATEGIES = {
+    "least_cloud": _select_least_cloud,
+}
+PLANNED_ORBIT_SELECTION_STRATEGIES = frozenset({"nearest_date", "max_coverage", "composite_score"})
 
-    return metadata
 
 def select_best_orbit(
         metadata: dict, 
@@ -129,51 +277,13 @@ def select_best_orbit(
     if not orbits:
         raise ValueError("No orbits found in metadata")
 
-    if strategy == "least_cloud":
-        def avg_cloud(orbit):
-            clouds = [tile.get("cloudCoverage", 100.0) for tile in orbit.get("tiles", [])]
-            return sum(clouds) / len(clouds) if clouds else 100.0
-        
-        def filter_orbits(metadata, tile_bbox):
-            """
-            Filter orbits based on spatial coverage over the tile.
-            Args:
-                metadata (dict): Orbit metadata dictionary.
-                tile_bbox (list): Tile bounding box coordinates.
-            Returns:
-                list: Filtered orbits with sufficient spatial coverage.
-            """
-            filtered_orbits = []
-            for orbit in metadata["orbits"]:                
-                orbit_geom = compute_orbit_bbox(orbit)
-
-                intersection_area = orbit_geom.intersection(box(*tile_bbox)).area
-                percentage_coverage = intersection_area / box(*tile_bbox).area
-
-                # Check if the orbit covers more than 90% of the tile
-                if percentage_coverage > 0.9:
-                    filtered_orbits.append(orbit)
-                
-            if not filtered_orbits:
-                raise ValueError("No valid orbits with sufficient spatial coverage.")
-            return filtered_orbits
-
-        valid_orbits = filter_orbits(metadata, tile_bbox)
-        best_orbit = min(valid_orbits, key=avg_cloud)
-
-        return {
-            "strategy": "least_cloud",
-            "orbit_date": best_orbit["dateFrom"][:10],
-            "product_ids": [tile["productId"] for tile in best_orbit["tiles"]],
-            "tile_ids": [tile["tileId"] for tile in best_orbit["tiles"]],
-            "cloud_coverage": round(avg_cloud(best_orbit), 2),
-            "orbit": best_orbit
-        }
-
-    elif strategy in {"nearest_date", "max_coverage", "composite_score"}:
-        raise NotImplementedError(f"Strategy '{strategy}' is not implemented yet.")
-    else:
+    select = ORBIT_SELECTION_STRATEGIES.get(strategy)
+    if select is None:
+        if strategy in PLANNED_ORBIT_SELECTION_STRATEGIES:
+            raise NotImplementedError(f"Strategy '{strategy}' is not implemented yet.")
         raise ValueError(f"Unknown orbit selection strategy: {strategy}")
+
+    return select(metadata, tile_bbox)
     
 def write_selected_orbit(
         paths: dict, 
@@ -185,56 +295,182 @@ def write_selected_orbit(
     Args:
         paths (dict): Output directory structure dictionary.
         orbit_data (dict): Data for the selected orbit.
-        prefix (str): Prefix for the output file name.
+        prefix (str): Prefix for the output file name. The metadata directory must already exist.
     """
-    os.makedirs(paths["metadata"], exist_ok=True)
     file_path = os.path.join(paths["metadata"], f"{prefix}_selected_orbit.json")
     with open(file_path, "w") as f:
         json.dump(orbit_data, f, indent=4)
 
+def _search_catalog_scenes(
+        paths: dict,
+        search_bbox: BBox,
+        time_interval: tuple[date, date],
+        config: SHConfig,
+        cache_ttl: float | None = None
+    ) -> list[dict]:
+    """
+    Fetch every Sentinel-2 L2A scene intersecting a bounding box with a single Catalog search.
+    Args:
+        paths (dict): Output directory structure dictionary.
+        search_bbox (BBox): Bounding box covering all tiles of the workflow.
+        time_interval (tuple): Tuple of (start_date, end_date).
+        config: SentinelHub config object.
+        cache_ttl (float, optional): Reuse a cached search result younger than this many seconds.
+            None disables the cache.
+    Returns:
+        list: STAC features restricted to CATALOG_SEARCH_FIELDS.
+    """
+    cache_path = None
+    if cache_ttl is not None:
+        cache_key = _metadata_cache_key(search_bbox, time_interval, json.dumps(CATALOG_SEARCH_FIELDS))
+        cache_path = get_metadata_cache_path(paths, cache_key)
+        cached = _load_cached_metadata(cache_path, cache_ttl)
+        if cached is not None:
+            return cached["features"]
+
+    catalog = get_pooled_catalog(config)
+    features = list(catalog.search(
+        collection=DataCollection.SENTINEL2_L2A,
+        bbox=search_bbox,
+        time=time_interval,
+        fields=CATALOG_SEARCH_FIELDS,
+    ))
+
+    if cache_path is not None:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        _write_json_atomic(cache_path, {"features": features}, indent=None)
+
+    return features
+
+def _index_geometries_by_tile(
+        tile_boxes: list,
+        geometries: list
+    ) -> list[list[int]]:
+    """
+    Spatially join geometries (e.g. scene or orbit footprints) against the tile grid.
+    All geometries are queried against an STRtree of the tiles in one bulk call.
+    Args:
+        tile_boxes (list): Shapely polygons of the workflow tiles.
+        geometries (list): Shapely geometries to assign to tiles.
+    Returns:
+        list: For each tile, the indices of the geometries intersecting it, in input order.
+    """
+    indices_by_tile = [[] for _ in tile_boxes]
+    if not geometries:
+        return indices_by_tile
+
+    geometry_idx, tile_idx = STRtree(tile_boxes).query(geometries, predicate="intersects")
+    for tile, geometry in sorted(zip(tile_idx.tolist(), geometry_idx.tolist())):
+        indices_by_tile[tile].append(geometry)
+    return indices_by_tile
+
+def _scene_tile_entry(
+        scene: dict,
+        footprint
+    ) -> dict:
+    """
+    Convert a Catalog scene into an orbit tile entry.
+    Args:
+        scene (dict): STAC feature restricted to CATALOG_SEARCH_FIELDS.
+        footprint: Shapely geometry of the scene, used for its dataEnvelope.
+    Returns:
+        dict: Tile entry with tileId, productId, datatake, date, cloudCoverage, dataGeometry and dataEnvelope.
+            tileId is the MGRS tile and datatake the mission and sensing start of the pass, both parsed
+            from the product name; they fall back to the scene id and None for unrecognised names.
+    """
+    match = S2_PRODUCT_ID_PATTERN.match(scene["id"])
+    return {
+        "tileId": match["tile"] if match else scene["id"],
+        "productId": scene["id"],
+        "datatake": f"{match['mission']}_{match['datatake']}_R{match['orbit']}" if match else None,
+        "date": scene["properties"]["datetime"],
+        "cloudCoverage": scene["properties"].get("eo:cloud_cover", 100.0),
+        "dataGeometry": {"crs": WGS84_GEOJSON_CRS, **scene["geometry"]},
+        # Bounding rectangle of the footprint, read by validate_image_coverage_with_tile_footprints
+        "dataEnvelope": {"crs": WGS84_GEOJSON_CRS, **mapping(box(*footprint.bounds))},
+    }
+
+def _orbits_from_entries(entries: list[dict]) -> list[dict]:
+    """
+    Group tile entries into orbit dictionaries with dateFrom, dateTo and tiles.
+    Scenes of one datatake, i.e. one continuous pass of a satellite, form an orbit, so two passes
+    over a tile on the same UTC day stay separate. Entries without a datatake are grouped by day.
+    Args:
+        entries (list): Tile entries of the scenes intersecting a single tile.
+    Returns:
+        list: Orbit dictionaries sorted by acquisition time.
+    """
+    orbits = {}
+    for entry in entries:
+        orbits.setdefault(entry.get("datatake") or entry["date"][:10], []).append(entry)
+
+    return sorted(
+        (
+            {
+                "datatake": tiles[0].get("datatake"),
+                "dateFrom": min(tile["date"] for tile in tiles),
+                "dateTo": max(tile["date"] for tile in tiles),
+                "tiles": tiles,
+            }
+            for tiles in orbits.values()
+        ),
+        key=lambda orbit: orbit["dateFrom"],
+    )
+
 def discover_metadata_for_tiles(
         paths: dict, 
         tiles: list[BBox], 
         profile: "DataAcquisitionConfig", 
-        config: SHConfig, 
-        evalscript: str
+        config: SHConfig
     ) -> dict:
     """
-    Discover and load orbit metadata for all tiles in a workflow.
+    Discover orbit metadata for all tiles in a workflow.
+    Scenes for the whole workflow are fetched with one Catalog search and assigned to the
+    tiles they intersect locally, instead of issuing one Processing API request per tile.
 
     Args:
         paths (dict): Output directory structure dictionary.
-        tiles (list): List of tile coordinates (BBox-like tuples).
+        tiles (list): List of tile BBoxes or coordinate tuples.
         profile: The profile object with region and time_interval.
         config: SentinelHub config object.
-        evalscript (str): Evalscript to use for metadata request.
     Returns:
         dict: Mapping of tile_prefix -> parsed orbit metadata.
     """
     log_step("🔎 Discovering orbit metadata for tiles...")
-    metadata_by_tile = {}
-    log_inline(f"📡 Discovering metadata: 0/{len(tiles)} tiles complete")
-    for idx, tile_coords in enumerate(tiles):
-        tile = BBox(list(tile_coords), CRS.WGS84)
-        tile_prefix = get_tile_prefix(profile, idx)
-
-        discover_orbit_metadata(
-            tile=tile,
-            time_interval=profile.time_interval,
-            config=config,
-            evalscript=evalscript,
-            paths=paths,
-            prefix=tile_prefix,
-        )
-
-        metadata_path = get_orbit_metadata_path(paths, tile_prefix)
-        with open(metadata_path, 'r') as f:
-            metadata_by_tile[tile_prefix] = json.load(f)
-
-        log_inline(f"📡 Discovering metadata: {idx + 1}/{len(tiles)} tiles complete")
-
-    print() # for newline after inline logging
-    return metadata_by_tile
+    os.makedirs(paths["metadata"], exist_ok=True)
+    # generate_safe_tiles already yields BBoxes; only raw coordinate lists need converting
+    tile_bboxes = [
+        tile if isinstance(tile, BBox) else BBox(list(tile), CRS.WGS84)
+        for tile in tiles
+    ]
+    tile_boxes = [box(*tile_bbox) for tile_bbox in tile_bboxes]
+    search_bbox = BBox(unary_union(tile_boxes).bounds, CRS.WGS84)
+
+    scenes = _search_catalog_scenes(
+        paths=paths,
+        search_bbox=search_bbox,
+        time_interval=profile.time_interval,
+        config=config,
+        cache_ttl=getattr(profile, "cache_ttl", None),
+    )
+
+    # One entry per scene, shared by every tile it intersects rather than copied per tile
+    scene_footprints = [shape(scene["geometry"]) for scene in scenes]
+    scene_entries = [_scene_tile_entry(scene, footprint) for scene, footprint in zip(scenes, scene_footprints)]
+    entries_by_tile = [
+        [scene_entries[scene_idx] for scene_idx in scene_indices]
+        for scene_indices in _index_geometries_by_tile(tile_boxes, scene_footprints)
+    ]
+
+    metadata_by_prefix = {}
+    tile_prefixes = get_tile_prefixes(profile, len(tile_bboxes))
+    for tile_prefix, tile_bbox, tile_entries in zip(tile_prefixes, tile_bboxes, entries_by_tile):
+        metadata = {"orbits": _orbits_from_entries(tile_entries), "tile_bbox": list(tile_bbox)}
+        _write_json_atomic(get_orbit_metadata_path(paths, tile_prefix), metadata)
+        metadata_by_prefix[tile_prefix] = metadata
+
+    log_success(f"📡 Found {len(scenes)} scenes across {len(tiles)} tiles")
+    return metadata_by_prefix
 
 def select_orbits_for_tiles(
         paths: dict,
@@ -255,7 +491,10 @@ def select_orbits_for_tiles(
     selected_orbits = {}
     failures = []
 
-    log_inline(f"🎯 Selecting orbits: 0/{len(metadata_by_tile)} tiles complete")
+    os.makedirs(paths["metadata"], exist_ok=True)
+    # Selection is local and fast, so redrawing the line for every tile would dominate the loop
+    log_selected = inline_progress("🎯 Selected orbits: {done}/{total} complete", len(metadata_by_tile))
+    log_selected(0)
     
     workflow_tile_path = os.path.join(paths["metadata"], "workflow_tile_metadata.json")
     with open(workflow_tile_path, "r") as f:
@@ -268,11 +507,12 @@ def select_orbits_for_tiles(
             orbit = select_best_orbit(metadata=metadata, profile=profile, tile_bbox=tile_bbox)
             write_selected_orbit(paths=paths, orbit_data=orbit, prefix=tile_prefix)
             selected_orbits[tile_prefix] = orbit
-            log_inline(f"🎯 Selected orbits: {len(selected_orbits)}/{len(metadata_by_tile)} complete")
+            log_selected(len(selected_orbits))
         except Exception as e:
             failures.append((tile_prefix, str(e)))
 
-    print() # for newline after inline logging
+    log_selected(len(selected_orbits), force=True)
+    end_inline()  # for newline after inline logging
 
     if failures:
         error_messages = [msg for _, msg in failures]
@@ -299,48 +539,101 @@ def has_valid_orbits(metadata_by_tile: dict) -> bool:
         for metadata in metadata_by_tile.values()
     )
 
-def discover_orbit_data_metadata(paths: dict, config: SHConfig) -> None:
+def _load_selected_orbits(metadata_dir: str) -> list[dict]:
+    """
+    Load every *_selected_orbit.json written to the metadata directory.
+    Args:
+        metadata_dir (str): Job metadata directory.
+    Returns:
+        list: Selected orbit dictionaries.
+    """
+    selected_orbits = []
+    with os.scandir(metadata_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith("_selected_orbit.json") and entry.is_file():
+                with open(entry.path, 'r') as f:
+                    selected_orbits.append(json.load(f))
+    return selected_orbits
+
+def _is_bad_request(error: Exception) -> bool:
+    """
+    Check whether a Sentinel Hub download failed with HTTP 400 Bad Request.
+    Args:
+        error (Exception): Exception raised by a Catalog search.
+    Returns:
+        bool: True if the request was rejected with status 400.
+    """
+    if not isinstance(error, DownloadFailedException):
+        return False
+    response = getattr(error.request_exception, "response", None)
+    return response is not None and response.status_code == 400
+
+def discover_orbit_data_metadata(
+        paths: dict,
+        config: SHConfig,
+        selected_orbits: dict | None = None,
+        max_workers: int = MAX_METADATA_WORKERS
+    ) -> dict:
     """
     Discover detailed product metadata for all unique Sentinel products used across all selected orbits.
     Args:
         paths (dict): Output directory structure dictionary.
         config: SentinelHub config object.
+        selected_orbits (dict, optional): Mapping of tile_prefix -> selected orbit, as returned by
+            select_orbits_for_tiles. When omitted, the *_selected_orbit.json files are read from disk.
+        max_workers (int): Maximum concurrent Catalog searches; lower it if Sentinel Hub rate limits kick in.
     Returns:
         dict: Mapping of product_id -> detailed metadata.
     """
     log_step("🔎 Discovering unique product metadata across all selected orbits...")
 
     metadata_dir = paths["metadata"]
-    orbit_files = glob.glob(os.path.join(metadata_dir, "*_selected_orbit.json"))
+    if selected_orbits is not None:
+        orbits = list(selected_orbits.values())
+    else:
+        orbits = _load_selected_orbits(metadata_dir)
 
-    if not orbit_files:
+    if not orbits:
         log_warning("No selected orbit metadata files found.")
         return {}
 
-    catalog = SentinelHubCatalog(config=config)
+    catalog = get_pooled_catalog(config)
 
-    seen_product_ids = set()
-    product_metadata = {}
+    # Deduplicate up front, keeping first-seen order, so each product is looked up once
+    product_ids = list(dict.fromkeys(
+        product_id for selected_orbit in orbits for product_id in selected_orbit.get("product_ids", [])
+    ))
 
-    for orbit_file in orbit_files:
-        with open(orbit_file, 'r') as f:
-            selected_orbit = json.load(f)
-
-        product_ids = selected_orbit.get("product_ids", [])
-        for product_id in product_ids:
-            if product_id in seen_product_ids:
-                continue
-            try:
-                results = list(catalog.search(collection=DataCollection.SENTINEL2_L2A, ids=[product_id]))
-                if results:
-                    product_metadata[product_id] = results[0]
-                    seen_product_ids.add(product_id)
-                    log_inline(f"📥 Retrieved metadata for product: {product_id}")
-                    print()  # newline for logging clarity
-                else:
-                    log_warning(f"No metadata found for product {product_id}")
-            except Exception as e:
-                log_warning(f"Error fetching metadata for {product_id}: {e}")
+    def fetch(chunk):
+        try:
+            return list(catalog.search(collection=DataCollection.SENTINEL2_L2A, ids=chunk))
+        except Exception as e:
+            if len(chunk) == 1:
+                log_warning(f"Error fetching metadata for {chunk[0]}: {e}")
+                return []
+            if not _is_bad_request(e):
+                # Outages and rate limits would only be amplified by splitting the batch
+                log_warning(f"Error fetching metadata for {len(chunk)} products: {e}")
+                return []
+            # One bad id or an oversized request rejects the whole batch; retry ids individually
+            return [result for product_id in chunk for result in fetch([product_id])]
+
+    chunks = [
+        product_ids[start:start + PRODUCT_SEARCH_BATCH_SIZE]
+        for start in range(0, len(product_ids), PRODUCT_SEARCH_BATCH_SIZE)
+    ]
+    found = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+        for results in executor.map(in_log_context(fetch), chunks):
+            for result in results:
+                found[result["id"]] = result
+
+    product_metadata = {}
+    for product_id in product_ids:
+        if product_id in found:
+            product_metadata[product_id] = found[product_id]
+        else:
+            log_warning(f"No metadata found for product {product_id}")
 
     output_path = os.path.join(metadata_dir, "product_metadata.json")
     with open(output_path, 'w') as f:
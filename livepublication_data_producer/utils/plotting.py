@@ -3,15 +3,19 @@ import json
 import os
 from typing import Any
 
-import matplotlib.patches as mpatches
-import matplotlib.pyplot as plt
 import numpy as np
 import rasterio
+from rasterio.enums import Resampling
 from rasterio.plot import show
 from shapely.geometry import box
 
 from .logging_utils import log_success, log_warning
 
+# imshow keyword arguments that plt.imsave applies identically
+IMSAVE_KWARGS = {"cmap", "vmin", "vmax", "origin"}
+# Longest side of rasters drawn into figures; matplotlib cannot show more detail than this
+PREVIEW_MAX_DIM = 2048
+
 
 def plot_image(
     image: np.ndarray,
@@ -31,11 +35,25 @@ def plot_image(
         title (str): Optional plot title.
         **kwargs: Additional arguments for plt.imshow.
     """
-    fig, ax = plt.subplots(nrows=1, ncols=1, figsize=(15, 15))
+    # matplotlib is imported on first use so importing the pipeline does not pay its startup cost
+    import matplotlib.pyplot as plt
+
+    # One scaled copy of the input, clipped in place rather than through a second temporary
+    image = np.multiply(image, factor)
     if clip_range is not None:
-        ax.imshow(np.clip(image * factor, *clip_range), **kwargs)
-    else:
-        ax.imshow(image * factor, **kwargs)
+        np.clip(image, *clip_range, out=image)
+
+    # Undecorated saves are encoded straight to PNG at native resolution, skipping figure setup
+    if save_path and not title and kwargs.keys() <= IMSAVE_KWARGS:
+        if image.ndim == 3 and np.issubdtype(image.dtype, np.floating):
+            np.clip(image, 0, 1, out=image)  # imshow clips float RGB(A) the same way
+        plt.imsave(save_path, image, **kwargs)
+        return
+
+    fig, ax = plt.subplots(nrows=1, ncols=1, figsize=(15, 15))
+    # Figures are rendered at screen resolution, so larger rasters are decimated before drawing
+    stride = -(-max(image.shape[:2]) // PREVIEW_MAX_DIM)
+    ax.imshow(image[::stride, ::stride], **kwargs)
 
     if title:
         ax.set_title(title)
@@ -50,6 +68,29 @@ def plot_image(
         plt.show()
 
 
+def read_rgb_preview(
+    src: rasterio.io.DatasetReader,
+    max_dim: int = PREVIEW_MAX_DIM
+) -> tuple[np.ndarray, rasterio.Affine]:
+    """
+    Read the first three bands of a raster, averaged down so neither side exceeds max_dim.
+    Args:
+        src (rasterio.io.DatasetReader): Open raster dataset.
+        max_dim (int): Maximum width or height of the returned image.
+    Returns:
+        tuple: (bands, transform) with bands shaped (3, height, width) and the matching affine transform.
+    """
+    scale = max(src.width, src.height) / max_dim
+    if scale <= 1:
+        return src.read([1, 2, 3]), src.transform
+
+    out_height = max(1, round(src.height / scale))
+    out_width = max(1, round(src.width / scale))
+    bands = src.read([1, 2, 3], out_shape=(3, out_height, out_width), resampling=Resampling.average)
+    transform = src.transform * rasterio.Affine.scale(src.width / out_width, src.height / out_height)
+    return bands, transform
+
+
 def plot_tile_product_overlay(paths):
     """
     Visualize sub-tile bounding boxes over a stitched image, color-coded by contributing Sentinel-2 product.
@@ -58,6 +99,10 @@ def plot_tile_product_overlay(paths):
     Returns:
         str: Path to the saved overlay image.
     """
+    import matplotlib.patches as mpatches
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+
     stitched_image_path = os.path.join(paths["imagery"], "true_color.tif")
     orbit_metadata_dir = paths["metadata"]
     tile_metadata_path = os.path.join(paths["metadata"], "workflow_tile_metadata.json")
@@ -73,11 +118,13 @@ def plot_tile_product_overlay(paths):
 
     with rasterio.open(stitched_image_path) as src:
         fig, ax = plt.subplots(figsize=(12, 12))
-        show(src.read([1, 2, 3]), transform=src.transform, ax=ax)
+        preview, preview_transform = read_rgb_preview(src)
+        show(preview, transform=preview_transform, ax=ax)
 
         product_to_color = {}
         product_colors = plt.get_cmap('tab20', 20)
         legend_handles = []
+        outlines_by_product = {}
 
         orbit_files = glob.glob(os.path.join(orbit_metadata_dir, "*_selected_orbit.json"))
         for idx, orbit_file in enumerate(orbit_files):
@@ -97,9 +144,14 @@ def plot_tile_product_overlay(paths):
                 legend_handles.append(mpatches.Patch(color=color, label=main_product_id))
 
             if tile_key in tile_bbox_lookup:
-                tile_geom = tile_bbox_lookup[tile_key]
-                x, y = tile_geom.exterior.xy
-                ax.plot(x, y, color=product_to_color[main_product_id], linewidth=2)
+                outlines_by_product.setdefault(main_product_id, []).append(
+                    np.asarray(tile_bbox_lookup[tile_key].exterior.coords)
+                )
+
+        # One collection per product instead of one line artist per tile
+        for product_id, outlines in outlines_by_product.items():
+            ax.add_collection(LineCollection(outlines, colors=[product_to_color[product_id]], linewidths=2))
+        ax.autoscale_view()  # ax.plot used to widen the view to outlines past the image edge
 
         ax.set_title("Sub-tile Coverage by Product ID")
         ax.legend(handles=legend_handles, loc='upper right', fontsize='small')
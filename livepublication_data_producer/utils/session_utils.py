@@ -0,0 +1,116 @@
+import json
+import threading
+from functools import cache
+
+import requests
+from requests.adapters import HTTPAdapter
+from sentinelhub import (
+    DataCollection,
+    SentinelHubCatalog,
+    SentinelHubDownloadClient,
+    SHConfig,
+)
+from sentinelhub.download.models import DownloadRequest
+from urllib3.util.retry import Retry
+
+# Sized above the largest thread pool issuing Sentinel Hub requests concurrently
+HTTP_POOL_SIZE = 32
+# Seconds to wait after a 429 without retry headers; matches the client SentinelHubCatalog builds
+CATALOG_RETRY_TIME = 30
+
+# Sentinel-2 L2A served by the Copernicus Data Space Ecosystem; defined once at import
+# instead of on every request
+CDSE_SERVICE_URL = "https://sh.dataspace.copernicus.eu"
+S2L2A_CDSE = DataCollection.SENTINEL2_L2A.define_from(name="s2l2a", service_url=CDSE_SERVICE_URL)
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """
+    Return the process-wide HTTP session used for Sentinel Hub requests.
+    The session keeps connections alive in a pool, so repeated requests to the same host
+    skip the TCP and TLS handshakes.
+    Returns:
+        requests.Session: Shared session with a pooled HTTPS adapter.
+    """
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                # Only connection errors are retried here; HTTP status retries (429, 5xx)
+                # are already handled by SentinelHubDownloadClient.
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_POOL_SIZE,
+                    pool_maxsize=HTTP_POOL_SIZE,
+                    max_retries=Retry(connect=3, read=0, backoff_factor=0.5),
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _http_session = session
+    return _http_session
+
+@cache
+def get_sh_config(
+        secrets_path: str = "secrets.json"
+    ) -> SHConfig:
+    """
+    Build the Sentinel Hub configuration from a secrets file, once per process.
+    Every caller and worker thread shares the returned config, and with it the cached
+    OAuth session of the download client.
+    Args:
+        secrets_path (str): Path to a JSON file with sh_client_id, sh_client_secret,
+            sh_base_url and sh_token_url.
+    Returns:
+        SHConfig: Configured Sentinel Hub config.
+    """
+    with open(secrets_path) as f:
+        secrets = json.load(f)
+
+    config = SHConfig()
+    config.sh_client_id = secrets["sh_client_id"]
+    config.sh_client_secret = secrets["sh_client_secret"]
+    config.sh_base_url = secrets["sh_base_url"]
+    config.sh_token_url = secrets["sh_token_url"]
+    return config
+
+
+class PooledSentinelHubDownloadClient(SentinelHubDownloadClient):
+    """
+    SentinelHubDownloadClient that sends requests through the shared keep-alive session
+    instead of opening a new connection per request. OAuth tokens are still cached by the
+    parent class.
+
+    Overrides the private ``_do_download`` hook, which is mirrored from sentinelhub 3.11/3.12;
+    pyproject.toml bounds the sentinelhub version to the releases this was checked against.
+    """
+
+    def _do_download(self, request: DownloadRequest) -> requests.Response:
+        if request.url is None:
+            raise ValueError(f"Faulty request {request}, no URL specified.")
+
+        return get_http_session().request(
+            request.request_type.value,
+            url=request.url,
+            json=request.post_values,
+            headers=self._prepare_headers(request),
+            timeout=self.config.download_timeout_seconds,
+        )
+
+
+def get_pooled_catalog(config: SHConfig) -> SentinelHubCatalog:
+    """
+    Build a SentinelHubCatalog whose requests go through the shared keep-alive session.
+
+    Args:
+        config (SHConfig): Sentinel Hub config object.
+    Returns:
+        SentinelHubCatalog: Catalog client using the pooled download client.
+    """
+    catalog = SentinelHubCatalog(config=config)
+    catalog.client = PooledSentinelHubDownloadClient(
+        config=config, default_retry_time=CATALOG_RETRY_TIME
+    )
+    return catalog
@@ -1,21 +1,34 @@
+import hashlib
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 import numpy as np
 from sentinelhub import (
     CRS,
     BBox,
-    DataCollection,
     MimeType,
     SentinelHubRequest,
     SHConfig,
     bbox_to_dimensions,
 )
 
-from .job_utils import get_tile_prefix
-from .logging_utils import log_inline, log_step, log_success, log_warning
+from .job_utils import get_tile_prefixes
+from .logging_utils import (
+    end_inline,
+    in_log_context,
+    log_inline,
+    log_step,
+    log_success,
+    log_warning,
+)
 from .metadata_utils import write_workflow_tile_metadata
+from .session_utils import S2L2A_CDSE, PooledSentinelHubDownloadClient
+
+# Concurrent Sentinel Hub downloads; kept modest to stay within per-account rate limits.
+# Transient failures are retried by the sentinelhub download client itself.
+MAX_DOWNLOAD_WORKERS = int(os.getenv("LP_TILE_WORKERS", "8"))
 
 
 def generate_safe_tiles(
@@ -42,15 +55,14 @@ def generate_safe_tiles(
     lon_steps = np.arange(min_lon, max_lon, tile_size_deg)
     lat_steps = np.arange(min_lat, max_lat, tile_size_deg)
 
-    tiles = []
-    for lon in lon_steps:
-        for lat in lat_steps:
-            tile = BBox([
-                lon, lat,
-                min(lon + tile_size_deg, max_lon),
-                min(lat + tile_size_deg, max_lat)
-            ], crs=CRS.WGS84)
-            tiles.append(tile)
+    # Tile corners for the whole grid at once; 'ij' indexing keeps the lon-major tile order
+    lon_grid, lat_grid = np.meshgrid(lon_steps, lat_steps, indexing="ij")
+    lon_hi = np.minimum(lon_grid + tile_size_deg, max_lon)
+    lat_hi = np.minimum(lat_grid + tile_size_deg, max_lat)
+    corners = np.stack([lon_grid, lat_grid, lon_hi, lat_hi], axis=-1).reshape(-1, 4)
+    # Guard against zero-width edge tiles from floating-point steps landing on the AOI bound
+    corners = corners[(corners[:, 2] > corners[:, 0]) & (corners[:, 3] > corners[:, 1])]
+    tiles = [BBox(coords, crs=CRS.WGS84) for coords in corners.tolist()]
     log_success(f"Generated {len(tiles)} tiles.")
     
     # Persist metadata for transparency
@@ -58,16 +70,108 @@ def generate_safe_tiles(
     
     return tiles
 
+def _tile_cache_key(
+        tile: BBox,
+        time_interval: tuple,
+        evalscript: str,
+        resolution: int
+    ) -> str:
+    """
+    Content-addressed key identifying a tile download request.
+    Args:
+        tile (BBox): Tile bounding box.
+        time_interval (tuple): Time interval for the request.
+        evalscript (str): Evalscript used for the request.
+        resolution (int): Resolution in meters.
+    Returns:
+        str: Hex digest of the request parameters.
+    """
+    request_repr = repr((tuple(tile), str(tile.crs), tuple(time_interval), evalscript, resolution))
+    return hashlib.blake2b(request_repr.encode(), digest_size=8).hexdigest()
+
+def _fetch_and_save_tile(
+        output_dir: str,
+        index: int,
+        tile: BBox,
+        time_interval: tuple,
+        prefix: str,
+        config: SHConfig,
+        evalscript: str
+    ) -> tuple[tuple | None, tuple | None]:
+    """
+    Download a single tile and save it as a .npy file.
+    The filename embeds a key of the request parameters, so a tile already downloaded by an
+    earlier run of the same job is reused without a network request.
+    Args:
+        output_dir (str): Directory to save the tile into.
+        index (int): Index of the tile within its batch, used in the filename.
+        tile (BBox): Tile bounding box.
+        time_interval (tuple): Time interval for the request.
+        prefix (str): Prefix for the output filename.
+        config (SHConfig): Configuration for Sentinel Hub.
+        evalscript (str): Evalscript to use for downloading imagery.
+    Returns:
+        tuple: (tile_info entry, None) on success or (None, (index, tile)) on failure.
+    """
+    resolution = 10
+    cache_key = _tile_cache_key(tile, time_interval, evalscript, resolution)
+    filename = f"{prefix}_{index:03}.{cache_key}.npy"
+    tile_path = os.path.join(output_dir, filename)
+    try:
+        cached_size = os.stat(tile_path).st_size
+    except FileNotFoundError:
+        cached_size = 0
+    if cached_size > 0:
+        # Shape and dtype are read back from the .npy header when stitching
+        return (filename, tile, None, None), None
+
+    size = bbox_to_dimensions(tile, resolution=resolution)
+
+    request = SentinelHubRequest(
+        evalscript=evalscript,
+        input_data=[
+            SentinelHubRequest.input_data(
+                data_collection=S2L2A_CDSE,
+                time_interval=time_interval,
+                other_args={"dataFilter": {"mosaickingOrder": "leastCC"}},
+            )
+        ],
+        responses=[SentinelHubRequest.output_response("default", MimeType.TIFF)],
+        bbox=tile,
+        size=size,
+        config=config,
+    )
+    request.download_client_class = PooledSentinelHubDownloadClient
+
+    try:
+        data = request.get_data()[0]
+        # A strided sample settles the common non-empty case without scanning the whole tile
+        if data is None or data.size == 0 or not (data[::64, ::64].any() or data.any()):
+            raise ValueError("Empty or invalid data")
+    except Exception as e:
+        end_inline()  # Ensure clean break from inline log
+        log_warning(f"⚠️ Failed to download tile {index}: {e}")
+        return None, (index, tile)
+
+    # Raw, uncompressed .npy so stitching can memory-map tiles instead of decoding them.
+    # Written to a temporary file first so an interrupted run never leaves a truncated cache hit.
+    tmp_path = f"{tile_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, data, allow_pickle=False)
+    os.replace(tmp_path, tile_path)
+    return (filename, tile, data.shape, data.dtype), None
+
 def download_safe_tiles(
         paths: dict, 
         tiles: list[BBox], 
         time_interval: tuple, 
         prefix: str,
         config: SHConfig, 
-        evalscript: str
+        evalscript: str,
+        max_workers: int = MAX_DOWNLOAD_WORKERS
     ) -> tuple[list[tuple], list[tuple]]:
     """
-    Download Sentinel Hub tiles using the provided evalscript.
+    Download Sentinel Hub tiles concurrently using the provided evalscript.
     Args:
         paths (dict): Dictionary of job output paths.
         tiles (list): List of BBox objects representing the tiles.
@@ -75,49 +179,23 @@ def download_safe_tiles(
         prefix (str): Prefix for the output filenames.
         config (dict): Configuration for Sentinel Hub.
         evalscript (str): Evalscript to use for downloading imagery.
+        max_workers (int): Maximum concurrent requests; lower it if Sentinel Hub rate limits kick in.
     Returns:
-        list: List of tuples containing tile filenames and their bounding boxes.
+        list: List of (filename, BBox, shape, dtype) tuples for the saved tiles.
         list: List of failed tiles.
     """
     output_dir = paths["raw_tiles"]
     os.makedirs(output_dir, exist_ok=True)
-    tile_info = []
-    failed_tiles = []
-
-    for i, tile in enumerate(tiles):
-        size = bbox_to_dimensions(tile, resolution=10)
-
-        request = SentinelHubRequest(
-            evalscript=evalscript,
-            input_data=[
-                SentinelHubRequest.input_data(
-                    data_collection=DataCollection.SENTINEL2_L2A.define_from(
-                        name="s2l2a", service_url="https://sh.dataspace.copernicus.eu"
-                    ),
-                    time_interval=time_interval,
-                    other_args={"dataFilter": {"mosaickingOrder": "leastCC"}},
-                )
-            ],
-            responses=[SentinelHubRequest.output_response("default", MimeType.TIFF)],
-            bbox=tile,
-            size=size,
-            config=config,
-        )
-
-        try:
-            data = request.get_data()[0]
-            if data is None or np.all(data == 0):
-                raise ValueError("Empty or invalid data")
-        except Exception as e:
-            print()  # Ensure clean break from inline log
-            log_warning(f"⚠️ Failed to download tile {i}: {e}")
-            failed_tiles.append((i, tile))
-            continue
-
-        npy_path = os.path.join(output_dir, f"{prefix}_{i:03}.npy")
-        np.save(npy_path, data)
-        tile_info.append((f"{prefix}_{i:03}.npy", tile))
 
+    def fetch(indexed_tile):
+        index, tile = indexed_tile
+        return _fetch_and_save_tile(output_dir, index, tile, time_interval, prefix, config, evalscript)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tiles)))) as executor:
+        results = list(executor.map(in_log_context(fetch), enumerate(tiles)))
+
+    tile_info = [info for info, _ in results if info is not None]
+    failed_tiles = [failure for _, failure in results if failure is not None]
     return tile_info, failed_tiles
 
 def download_orbits_for_tiles(
@@ -126,10 +204,11 @@ def download_orbits_for_tiles(
         selected_orbits: dict, 
         profile: "DataAcquisitionConfig", 
         config: SHConfig, 
-        evalscript: str
+        evalscript: str,
+        max_workers: int = MAX_DOWNLOAD_WORKERS
     ) -> tuple[list[tuple], list[tuple]]:
     """
-    Download imagery for each tile using its selected orbit.
+    Download imagery for each tile using its selected orbit, several tiles at a time.
     Args:
         paths (dict): Dictionary of job output paths.
         tiles (list): List of BBox tile geometries.
@@ -137,46 +216,62 @@ def download_orbits_for_tiles(
         profile: Profile object with region information.
         config: Sentinel Hub config object.
         evalscript (str): Evalscript to use for downloading imagery.
+        max_workers (int): Maximum concurrent requests; lower it if Sentinel Hub rate limits kick in.
     Returns:
         tuple: (tile_info, failed_tiles)
     """
-    if isinstance(tiles[0], tuple):
-        from .tile_utils import convert_tiles_to_bboxes
+    if tiles and not isinstance(tiles[0], BBox):
         tiles = convert_tiles_to_bboxes(tiles)
 
-    tile_info_all = []
-    failed_tiles_all = []
+    output_dir = paths["raw_tiles"]
+    os.makedirs(output_dir, exist_ok=True)
+    tile_prefixes = get_tile_prefixes(profile, len(tiles))
+    results_by_idx = {}
+    downloaded = 0
 
     log_inline(f"⏬ Downloading tiles: 0/{len(tiles)} complete")
-    for idx, tile in enumerate(tiles):
-        tile_prefix = get_tile_prefix(profile, idx)
-        try:
-            orbit_data = selected_orbits[tile_prefix]
-            orbit_date = orbit_data["orbit_date"]
-            time_interval = (orbit_date, orbit_date)
-        except KeyError:
-            # print()  # Ensure clean break from inline log
-            # log_warning(f"⚠️ Skipping tile {tile_prefix} — no selected orbit found.")
-            failed_tiles_all.append((idx, tile))
-            continue
-
-        tile_info, failed_tiles = download_safe_tiles(
-            paths=paths,
-            tiles=[tile],
-            time_interval=time_interval,
-            prefix=tile_prefix,
-            config=config,
-            evalscript=evalscript
-        )
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tiles)))) as executor:
+        futures = {}
+        for idx, (tile, tile_prefix) in enumerate(zip(tiles, tile_prefixes)):
+            try:
+                orbit_data = selected_orbits[tile_prefix]
+                orbit_date = orbit_data["orbit_date"]
+                time_interval = (orbit_date, orbit_date)
+            except KeyError:
+                # print()  # Ensure clean break from inline log
+                # log_warning(f"⚠️ Skipping tile {tile_prefix} — no selected orbit found.")
+                results_by_idx[idx] = ([], [(idx, tile)])
+                continue
+
+            # Each tile is its own single-tile batch, hence batch index 0
+            future = executor.submit(
+                in_log_context(_fetch_and_save_tile),
+                output_dir=output_dir,
+                index=0,
+                tile=tile,
+                time_interval=time_interval,
+                prefix=tile_prefix,
+                config=config,
+                evalscript=evalscript
+            )
+            futures[future] = idx
 
+        for future in as_completed(futures):
+            info, failure = future.result()
+            results_by_idx[futures[future]] = ([info] if info else [], [failure] if failure else [])
+            downloaded += info is not None
+            log_inline(f"⏬ Downloading tiles: {downloaded}/{len(tiles)} complete")
+
+    tile_info_all = []
+    failed_tiles_all = []
+    for idx in sorted(results_by_idx):
+        tile_info, failed_tiles = results_by_idx[idx]
         tile_info_all.extend(tile_info)
         failed_tiles_all.extend(failed_tiles)
 
-        log_inline(f"⏬ Downloading tiles: {len(tile_info_all)}/{len(tiles)} complete")
-
-    if len(failed_tiles_all) == len(tiles):
-        print()  # Ensure clean break from inline log
-        log_warning(f"All tiles failed for {tile_prefix}. Probably no orbits for day available.")
+    if tiles and len(failed_tiles_all) == len(tiles):
+        end_inline()  # Ensure clean break from inline log
+        log_warning(f"All tiles failed for {tile_prefixes[-1]}. Probably no orbits for day available.")
 
     return tile_info_all, failed_tiles_all
 
@@ -192,4 +287,5 @@ def convert_tiles_to_bboxes(
     Returns:
         list: List of BBox objects.
     """
-    return [BBox(list(coords), crs) for coords in tile_coords_list]
\ No newline at end of file
+    crs = CRS(crs)  # Resolve once rather than inside every BBox constructor
+    return [BBox(tuple(coords), crs) for coords in tile_coords_list]
\ No newline at end of file
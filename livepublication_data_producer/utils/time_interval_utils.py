@@ -1,11 +1,14 @@
-from copy import deepcopy
+from calendar import monthrange
+from collections.abc import Iterator
+from dataclasses import replace
 from datetime import date, timedelta
 
-from dateutil.relativedelta import relativedelta
-
 from .job_utils import generate_job_id
 from .logging_utils import log_warning
 
+# Calendar-month step of each month-based time_series_mode
+MONTHS_PER_INTERVAL = {"monthly": 1, "quarterly": 3}
+
 
 def generate_time_intervals(
         profile
@@ -24,7 +27,7 @@ def generate_time_intervals(
 
     # If custom intervals are defined, return them directly
     if profile.time_series_custom_intervals:
-        return profile.time_series_custom_intervals
+        return list(profile.time_series_custom_intervals)
 
     # Otherwise, use time_series_mode to derive intervals
     mode = profile.time_series_mode or "monthly"
@@ -33,40 +36,50 @@ def generate_time_intervals(
     if mode == "daily":
         return [(d, d) for d in daterange(start_date, end_date)]
 
-    elif mode == "monthly":
-        current = start_date
-        while current <= end_date:
-            next_month = current + relativedelta(months=1)
-            interval_end = min(next_month - timedelta(days=1), end_date)
-            intervals.append((current, interval_end))
-            current = next_month
-
-    elif mode == "quarterly":
+    elif mode in MONTHS_PER_INTERVAL:
+        months = MONTHS_PER_INTERVAL[mode]
         current = start_date
         while current <= end_date:
-            next_quarter = current + relativedelta(months=3)
-            interval_end = min(next_quarter - timedelta(days=1), end_date)
+            next_start = _add_months(current, months)
+            interval_end = min(next_start - timedelta(days=1), end_date)
             intervals.append((current, interval_end))
-            current = next_quarter
+            current = next_start
 
     else:
         raise ValueError(f"Unsupported time_series_mode: {mode}")
 
     return intervals
 
+def _add_months(
+        day: date,
+        months: int
+    ) -> date:
+    """
+    Shift a date by whole months, clamping the day to the target month's length.
+    Matches `day + relativedelta(months=months)` using integer month arithmetic.
+    Args:
+        day (date): Date to shift.
+        months (int): Number of months to add.
+    Returns:
+        date: The shifted date.
+    """
+    year, month_index = divmod(day.year * 12 + day.month - 1 + months, 12)
+    month = month_index + 1
+    return date(year, month, min(day.day, monthrange(year, month)[1]))
+
 def daterange(
         start: date, 
         end: date
-    ) -> list[date]:
+    ) -> Iterator[date]:
     """
-    Generate a list of dates between start and end, inclusive.
+    Lazily yield the dates between start and end, inclusive.
     Args:
         start (date): Start date.
         end (date): End date.
     Returns:
-        list of dates
+        iterator of dates
     """
-    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    return map(date.fromordinal, range(start.toordinal(), end.toordinal() + 1))
 
 def create_timeseries_jobs(
         profile
@@ -79,23 +92,20 @@ def create_timeseries_jobs(
     Returns:
         list[DataAcquisitionConfig]: A list of derived job profiles with modified time intervals and job metadata.
     """
-    from profiles import (
-        DataAcquisitionConfig,  # Local import to avoid circular dependency
-    )
-
-    # Ensure the parent profile has a job_id
-    if not getattr(profile, "job_id", None):
-        profile.job_id = generate_job_id(profile)
+    # Profiles are frozen, so a missing parent job_id is derived here rather than assigned
+    parent_job_id = getattr(profile, "job_id", None)
+    if not parent_job_id:
+        parent_job_id = generate_job_id(profile)
         log_warning("⚠️  Parent profile was missing a job_id — generated one automatically.")
 
     time_intervals = generate_time_intervals(profile)
     timeseries_jobs = []
 
     for interval in time_intervals:
-        sub_profile = deepcopy(profile)
-        sub_profile.time_interval = interval
-        sub_profile.parent_job_id = profile.job_id
-        sub_profile.job_id = generate_job_id(sub_profile)
-        timeseries_jobs.append(sub_profile)
+        # Shallow copy: sub-profiles only override scalar fields and never mutate shared ones.
+        # Clearing job_id lets __post_init__ derive the sub-job's id from its interval and parent.
+        timeseries_jobs.append(
+            replace(profile, time_interval=interval, parent_job_id=parent_job_id, job_id=None)
+        )
 
     return timeseries_jobs
@@ -5,18 +5,21 @@ import json
 import os
 import shutil
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 import matplotlib.gridspec as gridspec
 import matplotlib.image as mpimg
 import matplotlib.pyplot as plt
 import numpy as np
 
-# === Load parser and arguments ===
-parser = argparse.ArgumentParser()
-parser.add_argument("--archive", type=str, default=None, help="Optional archive folder name")
-args = parser.parse_args()
-
 temp_extract_dir = None
+# Archive members the viewer displays; everything else in a job archive is skipped on extraction
+VIEWER_IMAGE_SUFFIXES = ("/imagery/ndvi.png", "/imagery/true_color.png")
+VIEWER_METADATA_SUFFIX = "_selected_orbit.json"
+
+def is_viewer_file(name):
+    return f"/{name}".endswith(VIEWER_IMAGE_SUFFIXES) or name.endswith(VIEWER_METADATA_SUFFIX)
 
 def extract_archive_if_needed(archive_name):
     global temp_extract_dir
@@ -28,10 +31,11 @@ def extract_archive_if_needed(archive_name):
             os.makedirs(temp_extract_dir, exist_ok=True)
 
             print(archive_path)
-            # Extract the zip file to the temporary directory
+            # Extract only what the viewer reads; archives also hold raw tiles and GeoTIFFs
             with zipfile.ZipFile(archive_path, 'r') as zip_ref:
-                zip_ref.extractall(temp_extract_dir)
-                print(f"✓ Extracted {archive_path} to {temp_extract_dir}")
+                viewer_files = [name for name in zip_ref.namelist() if is_viewer_file(name)]
+                zip_ref.extractall(temp_extract_dir, members=viewer_files)
+                print(f"✓ Extracted {len(viewer_files)} viewer files from {archive_path} to {temp_extract_dir}")
 
             print(f"📦 Extracted archive '{archive_name}' to temporary location for viewing.")
 
@@ -43,14 +47,6 @@ def extract_archive_if_needed(archive_name):
             return archive_path
     return None
 
-base_path = extract_archive_if_needed(args.archive)
-
-if base_path is None:
-    output_dirs = sorted(glob.glob("outputs/*/"), key=os.path.getmtime, reverse=True)
-    if not output_dirs:
-        raise FileNotFoundError("No output directories found in 'outputs/'.")
-    base_path = output_dirs[0].rstrip("/")
-
 def format_metadata_summary(selected_orbits):
     metadata_summary = ""
     if selected_orbits:
@@ -83,10 +79,8 @@ def format_metadata_summary(selected_orbits):
 
 def load_timeseries_frames(base_path):
     timeseries_frames = []
-    subdirs = sorted([
-        os.path.join(base_path, d) for d in os.listdir(base_path)
-        if os.path.isdir(os.path.join(base_path, d))
-    ])
+    with os.scandir(base_path) as entries:
+        subdirs = sorted(entry.path for entry in entries if entry.is_dir())
     for subdir in subdirs:
         ndvi_path = os.path.join(subdir, "imagery", "ndvi.png")
         rgb_path = os.path.join(subdir, "imagery", "true_color.png")
@@ -94,18 +88,22 @@ def load_timeseries_frames(base_path):
         selected_orbits = glob.glob(os.path.join(metadata_dir, "*_selected_orbit.json"))
 
         if os.path.exists(ndvi_path) and os.path.exists(rgb_path):
-            ndvi = mpimg.imread(ndvi_path)
-            rgb = mpimg.imread(rgb_path)
+            # Images are decoded on demand by load_image; only their paths are kept here
             meta_summary = format_metadata_summary(selected_orbits)
             label = os.path.basename(subdir)
             timeseries_frames.append({
-                "ndvi": ndvi,
-                "rgb": rgb,
+                "ndvi_path": ndvi_path,
+                "rgb_path": rgb_path,
                 "metadata": meta_summary,
                 "label": label
             })
     return timeseries_frames
 
+# Decoded frames around the current one stay cached, so stepping back and forth does not re-read PNGs
+@lru_cache(maxsize=8)
+def load_image(path):
+    return mpimg.imread(path)
+
 def load_single_frame(base_path):
     ndvi_path = os.path.join(base_path, "imagery", "ndvi.png")
     rgb_path = os.path.join(base_path, "imagery", "true_color.png")
@@ -118,17 +116,6 @@ def load_single_frame(base_path):
     
     return ndvi, rgb, metadata_summary
 
-# Determine if this is a timeseries job (has sub-job folders)
-is_timeseries = any(
-    os.path.isdir(os.path.join(base_path, name)) and 
-    os.path.isdir(os.path.join(base_path, name, "imagery"))
-    for name in os.listdir(base_path)
-)
-
-# Load data
-timeseries_frames = load_timeseries_frames(base_path) if is_timeseries else []
-ndvi, rgb, metadata_summary = load_single_frame(base_path) if not is_timeseries else (None, None, None)
-
 def setup_figure():
     fig = plt.figure(figsize=(12, 8))
     gs = gridspec.GridSpec(2, 2, height_ratios=[3, 1])
@@ -138,67 +125,118 @@ def setup_figure():
     ax_text.axis("off")
     return fig, ax1, ax2, ax_text
 
-fig, ax1, ax2, ax_text = setup_figure()
-frame_idx = [0]
+def prefetch_neighbours(executor, timeseries_frames, idx):
+    # Neighbouring frames are decoded in the background while the current one is displayed
+    for neighbour in (idx + 1, idx - 1):
+        if 0 <= neighbour < len(timeseries_frames):
+            frame = timeseries_frames[neighbour]
+            executor.submit(load_image, frame["ndvi_path"])
+            executor.submit(load_image, frame["rgb_path"])
+
+def resolve_base_path(archive_name):
+    base_path = extract_archive_if_needed(archive_name)
+
+    if base_path is None:
+        output_dirs = sorted(glob.glob("outputs/*/"), key=os.path.getmtime, reverse=True)
+        if not output_dirs:
+            raise FileNotFoundError("No output directories found in 'outputs/'.")
+        base_path = output_dirs[0].rstrip("/")
+    return base_path
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--archive", type=str, default=None, help="Optional archive folder name")
+    args = parser.parse_args()
+
+    base_path = resolve_base_path(args.archive)
+
+    # Determine if this is a timeseries job (has sub-job folders)
+    # scandir entries carry their file type, so only the imagery check needs a stat
+    with os.scandir(base_path) as entries:
+        is_timeseries = any(
+            entry.is_dir() and os.path.isdir(os.path.join(entry.path, "imagery"))
+            for entry in entries
+        )
+
+    # Load data
+    timeseries_frames = load_timeseries_frames(base_path) if is_timeseries else []
+    ndvi, rgb, metadata_summary = load_single_frame(base_path) if not is_timeseries else (None, None, None)
+
+    prefetch_executor = ThreadPoolExecutor(max_workers=1)
+    fig, ax1, ax2, ax_text = setup_figure()
+    frame_idx = [0]
+
+    # Image and text artists are created on the first draw and updated in place for later frames
+    frame_artists = {}
+
+    def show_frame_data(ndvi_data, rgb_data, metadata_text):
+        if not frame_artists:
+            ax1.axis("off")
+            ax2.axis("off")
+            frame_artists["ndvi"] = ax1.imshow(ndvi_data, cmap='RdYlGn', vmin=-1, vmax=1)
+            frame_artists["rgb"] = ax2.imshow(rgb_data)
+            frame_artists["text"] = ax_text.text(0, 1, metadata_text, fontsize=9, color='black',
+                                                 verticalalignment='top', family='monospace')
+            return
+
+        for key, data in (("ndvi", ndvi_data), ("rgb", rgb_data)):
+            image = frame_artists[key]
+            if image.get_array().shape[:2] != data.shape[:2]:
+                height, width = data.shape[:2]
+                image.set_extent((-0.5, width - 0.5, height - 0.5, -0.5))
+            image.set_data(data)
+        frame_artists["text"].set_text(metadata_text)
+
+    def draw_frame(idx):
+        if is_timeseries:
+            frame = timeseries_frames[idx]
+            show_frame_data(load_image(frame["ndvi_path"]), load_image(frame["rgb_path"]), frame["metadata"])
+            fig.suptitle(f"Frame {idx+1}/{len(timeseries_frames)} — {frame['label']}")
+            prefetch_neighbours(prefetch_executor, timeseries_frames, idx)
+        else:
+            show_frame_data(ndvi, rgb, metadata_summary)
 
-def draw_frame(idx):
-    ax1.clear()
-    ax2.clear()
-    ax_text.clear()
-    ax_text.axis("off")
-    ax1.axis("off")
-    ax2.axis("off")
-
-    if is_timeseries:
-        frame = timeseries_frames[idx]
-        ax1.imshow(frame["ndvi"], cmap='RdYlGn', vmin=-1, vmax=1)
-        ax2.imshow(frame["rgb"])
-        ax_text.text(0, 1, frame["metadata"], fontsize=9, color='black',
-                     verticalalignment='top', family='monospace')
-        fig.suptitle(f"Frame {idx+1}/{len(timeseries_frames)} — {frame['label']}")
-    else:
-        ax1.imshow(ndvi, cmap='RdYlGn', vmin=-1, vmax=1)
-        ax2.imshow(rgb)
-        ax_text.text(0, 1, metadata_summary, fontsize=9, color='black',
-                     verticalalignment='top', family='monospace')
-
-    fig.canvas.draw_idle()
-
-def on_key(event):
-    if not is_timeseries:
-        return
-    if event.key == 'right':
-        frame_idx[0] = min(frame_idx[0] + 1, len(timeseries_frames) - 1)
-        draw_frame(frame_idx[0])
-    elif event.key == 'left':
-        frame_idx[0] = max(frame_idx[0] - 1, 0)
-        draw_frame(frame_idx[0])
-
-def on_scroll(event):
-    base_scale = 1.2
-    if event.inaxes not in [ax1, ax2]:
-        return
-
-    ax = event.inaxes
-    cur_xlim = ax.get_xlim()
-    cur_ylim = ax.get_ylim()
-    xdata = event.xdata
-    ydata = event.ydata
-
-    scale_factor = 1 / base_scale if event.button == 'up' else base_scale
-
-    new_width = (cur_xlim[1] - cur_xlim[0]) * scale_factor
-    new_height = (cur_ylim[1] - cur_ylim[0]) * scale_factor
-    relx = (cur_xlim[1] - xdata) / (cur_xlim[1] - cur_xlim[0])
-    rely = (cur_ylim[1] - ydata) / (cur_ylim[1] - cur_ylim[0])
-
-    for ax in [ax1, ax2]:
-        ax.set_xlim([xdata - new_width * (1 - relx), xdata + new_width * relx])
-        ax.set_ylim([ydata - new_height * (1 - rely), ydata + new_height * rely])
-
-    fig.canvas.draw_idle()
-
-fig.canvas.mpl_connect('key_press_event', on_key)
-fig.canvas.mpl_connect('scroll_event', on_scroll)
-draw_frame(0)
-plt.show()
\ No newline at end of file
+        fig.canvas.draw_idle()
+
+    def on_key(event):
+        if not is_timeseries:
+            return
+        if event.key == 'right':
+            frame_idx[0] = min(frame_idx[0] + 1, len(timeseries_frames) - 1)
+            draw_frame(frame_idx[0])
+        elif event.key == 'left':
+            frame_idx[0] = max(frame_idx[0] - 1, 0)
+            draw_frame(frame_idx[0])
+
+    def on_scroll(event):
+        base_scale = 1.2
+        if event.inaxes not in [ax1, ax2]:
+            return
+
+        ax = event.inaxes
+        cur_xlim = ax.get_xlim()
+        cur_ylim = ax.get_ylim()
+        xdata = event.xdata
+        ydata = event.ydata
+
+        scale_factor = 1 / base_scale if event.button == 'up' else base_scale
+
+        new_width = (cur_xlim[1] - cur_xlim[0]) * scale_factor
+        new_height = (cur_ylim[1] - cur_ylim[0]) * scale_factor
+        relx = (cur_xlim[1] - xdata) / (cur_xlim[1] - cur_xlim[0])
+        rely = (cur_ylim[1] - ydata) / (cur_ylim[1] - cur_ylim[0])
+
+        for ax in [ax1, ax2]:
+            ax.set_xlim([xdata - new_width * (1 - relx), xdata + new_width * relx])
+            ax.set_ylim([ydata - new_height * (1 - rely), ydata + new_height * rely])
+
+        fig.canvas.draw_idle()
+
+    fig.canvas.mpl_connect('key_press_event', on_key)
+    fig.canvas.mpl_connect('scroll_event', on_scroll)
+    draw_frame(0)
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()